@@ -0,0 +1,89 @@
+"""
+Shared pieces of the Patrol 1 aircraft contact parsers (parse_aircraft_v2/v3/v4
+and parse_aircraft_tables): the contact table's page layout, OCR loading, the
+common patterns, and the date, time and aircraft-type extraction.
+"""
+
+import json
+import re
+
+REPORTS_DIR = "/home/jmknapp/cobia/patrolReports"
+
+# Known structure: contacts 1-32 across pages 22-28
+PAGE_MAP = [
+    (22, 1, 5),   # page, start_contact, num_contacts
+    (23, 6, 5),
+    (24, 11, 5),
+    (25, 16, 5),
+    (26, 21, 5),
+    (27, 26, 5),
+    (28, 31, 2),
+]
+
+# Patterns are compiled once here rather than on every call
+MONTHS = ['January', 'February', 'March', 'April', 'May', 'June',
+          'July', 'August', 'September', 'October', 'November', 'December']
+
+DATE_PATTERN = re.compile(r'(\d{1,2})\s+(' + '|'.join(MONTHS) + ')', re.IGNORECASE)
+TIME_PATTERN = re.compile(r'^\d{4}$')
+TIME_PREFIX_PATTERN = re.compile(r'^(\d{4})\s')
+# Any coordinate: DD-MM.D or DDD-MM.D with optional direction
+COORD_PATTERN = re.compile(r'(\d{1,3})-(\d{2})(?:\.(\d))?([NSEW])?')
+
+def load_ocr():
+    """Load the 1st patrol report's Google Vision OCR JSON ({page: text})."""
+    with open(f'{REPORTS_DIR}/USS_Cobia_1st_Patrol_Report_gv_ocr.json') as f:
+        return json.load(f)
+
+def parse_pages(ocr, parse_page):
+    """Run a script's parse_page over each table page in PAGE_MAP."""
+    all_contacts = []
+    for page_num, start_contact, num_contacts in PAGE_MAP:
+        text = ocr.get(str(page_num), '')
+        contacts = parse_page(page_num, text, start_contact, num_contacts)
+        all_contacts.extend(contacts)
+    return all_contacts
+
+def extract_dates(text):
+    """Extract dates like '27 June' or '13 August'."""
+    matches = DATE_PATTERN.findall(text)
+    return [f"{m[0]} {m[1]}" for m in matches]
+
+def extract_times(text, line_start=True):
+    """Extract 4-digit times from lines.
+
+    A line that is just a time counts; with line_start, so does a time
+    followed by more text at the start of a line.
+    """
+    times = []
+    for line in text.split('\n'):
+        line = line.strip()
+        # Must be exactly 4 digits and a valid time
+        if TIME_PATTERN.match(line):
+            val = int(line)
+            if 0 <= val <= 2359:
+                times.append(line)
+        # Also check for times at start of line
+        if line_start:
+            m = TIME_PREFIX_PATTERN.match(line)
+            if m:
+                val = int(m.group(1))
+                if 0 <= val <= 2359:
+                    times.append(m.group(1))
+    return times
+
+def compile_types(type_patterns):
+    """Compile (pattern, name, friendly) aircraft-type entries, ignoring case."""
+    return [(re.compile(pattern, re.IGNORECASE), name, friendly)
+            for pattern, name, friendly in type_patterns]
+
+def types_in_order(text, type_patterns):
+    """Return (name, friendly) for every type mention, in order of appearance."""
+    all_matches = []
+    for pattern, name, friendly in type_patterns:
+        for m in pattern.finditer(text):
+            all_matches.append((m.start(), name, friendly))
+
+    # Sort by position
+    all_matches.sort(key=lambda x: x[0])
+    return [(m[1], m[2]) for m in all_matches]
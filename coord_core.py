@@ -0,0 +1,133 @@
+"""
+Shared pieces of the USS Cobia position extractors (extract_positions_v4/v5):
+patrol list, pattern compilation, date detection, OCR loading, the process
+pool that runs a script's extract_from_page over every page, and CSV output.
+"""
+
+import os
+import re
+import json
+import csv
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+
+try:
+    import re2  # google-re2: linear-time DFA matching, same API as re
+except ImportError:
+    re2 = None  # fall back to the stdlib engine
+
+REPORTS_DIR = "/home/jmknapp/cobia/patrolReports"
+
+PATROLS = [
+    ("USS_Cobia_1st_Patrol_Report", 1),
+    ("USS_Cobia_2nd_Patrol_Report", 2),
+    ("USS_Cobia_3rd_Patrol_Report", 3),
+    ("USS_Cobia_4th_Patrol_Report", 4),
+    ("USS_Cobia_5th_Patrol_Report", 5),
+    ("USS_Cobia_6th_Patrol_Report", 6),
+]
+
+CSV_FIELDS = [
+    'patrol', 'page', 'date', 'type',
+    'latitude', 'longitude',
+    'lat_raw', 'lon_raw', 'issues'
+]
+
+def compile_pattern(pattern, flags=0):
+    """Compile a coordinate/date pattern with RE2 if installed, else with re."""
+    if re2 is None:
+        return re.compile(pattern, flags)
+    if flags & re.IGNORECASE:
+        pattern = '(?i)' + pattern
+    return re2.compile(pattern)
+
+DATE_PATTERN = compile_pattern(
+    r'(January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{1,2})',
+    re.IGNORECASE
+)
+
+# Cheap prefilter for DATE_PATTERN: a date needs a month initial and a digit,
+# and most OCR lines have no digits at all, so skip the regex for those.
+MONTH_INITIALS = frozenset('JFMASONDjfmasond')
+DIGIT = re.compile(r'\d')
+
+def match_date(line):
+    """Return "Month D" for the first date on the line, or None."""
+    if MONTH_INITIALS.isdisjoint(line) or not DIGIT.search(line):
+        return None
+    dm = DATE_PATTERN.search(line)
+    if dm:
+        return f"{dm.group(1)} {dm.group(2)}"
+    return None
+
+def iter_lines(text):
+    """Yield the '\n'-separated lines of text without building a list."""
+    start = 0
+    while True:
+        end = text.find('\n', start)
+        if end < 0:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+def load_ocr(report_name):
+    """Load a report's Google Vision OCR JSON ({page: text}), or None if missing."""
+    json_path = os.path.join(REPORTS_DIR, f"{report_name}_gv_ocr.json")
+    if not os.path.exists(json_path):
+        return None
+    with open(json_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _extract_task(task):
+    """Process-pool entry point: run one script's extractor on one page."""
+    extract_from_page, text, patrol_num, page_num = task
+    return extract_from_page(text, patrol_num, page_num)
+
+def extract_all(extract_from_page):
+    """Run extract_from_page over every page of every patrol report.
+
+    The OCR JSON is loaded here in the parent and the per-page regex work is
+    farmed out to worker processes (the parsing is CPU-bound, so threads
+    won't help). Prints a per-patrol count and returns all positions.
+    """
+    tasks = []
+    loaded = []
+    for report_name, patrol_num in PATROLS:
+        ocr_data = load_ocr(report_name)
+        if ocr_data is None:
+            print(f"  Patrol {patrol_num}: OCR file not found")
+            continue
+
+        loaded.append(patrol_num)
+        for page_str, text in ocr_data.items():
+            tasks.append((extract_from_page, text, patrol_num, int(page_str)))
+
+    all_positions = []
+    with ProcessPoolExecutor() as executor:
+        for positions in executor.map(_extract_task, tasks, chunksize=32):
+            all_positions.extend(positions)
+
+    counts = Counter(p['patrol'] for p in all_positions)
+    for patrol_num in loaded:
+        print(f"  Patrol {patrol_num}: {counts[patrol_num]} positions")
+
+    return all_positions
+
+# Pulls a position dict's values out as a row tuple in CSV_FIELDS order
+csv_row = itemgetter(*CSV_FIELDS)
+
+def write_csv(rows, path):
+    """Write position dicts (any iterable) to a CSV with the standard column order."""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_FIELDS)
+        writer.writerows(map(csv_row, rows))
+
+def print_patrol_counts(rows):
+    """Print the "By patrol" summary for patrols 1-6."""
+    counts = Counter(p['patrol'] for p in rows)
+    print("\nBy patrol:")
+    for pn in range(1, 7):
+        print(f"  Patrol {pn}: {counts[pn]} positions")
@@ -6,63 +6,52 @@ Handles all observed formats including table formats without E/W suffix.
 
 import os
 import re
-import json
-import csv
+from functools import lru_cache
 
-REPORTS_DIR = "/home/jmknapp/cobia/patrolReports"
-
-PATROLS = [
-    ("USS_Cobia_1st_Patrol_Report", 1),
-    ("USS_Cobia_2nd_Patrol_Report", 2),
-    ("USS_Cobia_3rd_Patrol_Report", 3),
-    ("USS_Cobia_4th_Patrol_Report", 4),
-    ("USS_Cobia_5th_Patrol_Report", 5),
-    ("USS_Cobia_6th_Patrol_Report", 6),
-]
+from coord_core import (
+    REPORTS_DIR, compile_pattern, extract_all, iter_lines, match_date,
+    print_patrol_counts, write_csv,
+)
 
 # Pattern 1: "Lat. XX-XXN Long. YY-YYE"
-PATTERN1 = re.compile(
+PATTERN1 = compile_pattern(
     r'Lat\.?\s*(\d{1,3})[°\-](\d{1,2})[\'"]?\s*([NS])\s*Long\.?\s*(\d{1,3})[°\-](\d{1,2})[\'"]?\s*([EW])',
     re.IGNORECASE
 )
 
 # Pattern 2: "Position: XX-XX.X S YYY-YY.X E"
-PATTERN2 = re.compile(
+PATTERN2 = compile_pattern(
     r'Position[:\s]+(\d{1,3})[°\-](\d{1,2}(?:\.\d)?)\s*([NS])\s+(\d{1,3})[°\-](\d{1,2}(?:\.\d)?)\s*([EW])',
     re.IGNORECASE
 )
 
 # Pattern 3: Lat like "18-30N" followed by lon like "120-30" (no E) on same line
 # This handles table formats where E is implied
-PATTERN3 = re.compile(
-    r'(\d{1,2})[°\-](\d{1,2})\s*([NS])[^0-9]*?(\d{2,3})[°\-](\d{1,2})(?:\s*([EW]))?',
-    re.IGNORECASE
+PATTERN3 = compile_pattern(
+    r'(\d{1,2})[°\-](\d{1,2})\s*([NSns])[^0-9]*?(\d{2,3})[°\-](\d{1,2})(?:\s*([EWew]))?'
 )
 
 # Pattern 4: coordinates with space before direction "16-7 N" then "145-7"
-PATTERN4 = re.compile(
-    r'(\d{1,2})[°\-](\d{1,2})\s+([NS])[^0-9]*?(\d{2,3})[°\-](\d{1,2})',
-    re.IGNORECASE
-)
-
-DATE_PATTERN = re.compile(
-    r'(January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{1,2})',
-    re.IGNORECASE
+PATTERN4 = compile_pattern(
+    r'(\d{1,2})[°\-](\d{1,2})\s+([NSns])[^0-9]*?(\d{2,3})[°\-](\d{1,2})'
 )
 
+# The same fixes recur across pages, so parse each raw coordinate only once.
+@lru_cache(maxsize=None)
 def parse_coord(degrees, minutes, direction):
-    """Convert degrees-minutes to decimal degrees."""
-    try:
-        deg = int(degrees)
-        min_val = float(minutes)
-        if deg > 180 or min_val > 59.9:
-            return None, f"Invalid: {deg}-{minutes}{direction}"
-        decimal = deg + min_val / 60.0
-        if direction and direction.upper() in ['S', 'W']:
-            decimal = -decimal
-        return round(decimal, 4), None
-    except:
-        return None, "Parse error"
+    """Convert degrees-minutes to decimal degrees.
+
+    The pattern groups are always digit strings (minutes optionally with
+    one decimal place), so no exception handling is needed here.
+    """
+    deg = int(degrees)
+    min_val = float(minutes) if '.' in minutes else int(minutes)
+    if deg > 180 or min_val > 59.9:
+        return None, f"Invalid: {deg}-{minutes}{direction}"
+    decimal = deg + min_val / 60.0
+    if direction and direction.upper() in ['S', 'W']:
+        decimal = -decimal
+    return round(decimal, 4), None
 
 def validate_position(lat, lon):
     issues = []
@@ -73,28 +62,29 @@ def validate_position(lat, lon):
 def extract_from_page(text, patrol_num, page_num):
     positions = []
     seen = set()
-    
-    lines = text.split('\n')
     current_date = None
     
-    for line in lines:
-        dm = DATE_PATTERN.search(line)
-        if dm:
-            current_date = f"{dm.group(1)} {dm.group(2)}"
+    for line in iter_lines(text):
+        date = match_date(line)
+        if date:
+            current_date = date
         
         # Try Pattern 1
+        is_noon = None  # lowered at most once, on the first hit in this line
         for m in PATTERN1.finditer(line):
             lat_deg, lat_min, lat_dir, lon_deg, lon_min, lon_dir = m.groups()
-            key = f"{lat_deg}-{lat_min}{lat_dir}_{lon_deg}-{lon_min}{lon_dir}"
+            key = (lat_deg, lat_min, lat_dir, lon_deg, lon_min, lon_dir)
             if key not in seen:
                 seen.add(key)
                 lat, _ = parse_coord(lat_deg, lat_min, lat_dir)
                 lon, _ = parse_coord(lon_deg, lon_min, lon_dir)
                 if lat and lon:
+                    if is_noon is None:
+                        is_noon = "noon" in line.lower()
                     positions.append({
                         'patrol': patrol_num, 'page': page_num,
                         'date': current_date or "",
-                        'type': "Noon" if "noon" in line.lower() else "Position",
+                        'type': "Noon" if is_noon else "Position",
                         'latitude': lat, 'longitude': lon,
                         'lat_raw': f"{lat_deg}-{lat_min}{lat_dir}",
                         'lon_raw': f"{lon_deg}-{lon_min}{lon_dir}",
@@ -104,7 +94,7 @@ def extract_from_page(text, patrol_num, page_num):
         # Try Pattern 2
         for m in PATTERN2.finditer(line):
             lat_deg, lat_min, lat_dir, lon_deg, lon_min, lon_dir = m.groups()
-            key = f"{lat_deg}-{lat_min}{lat_dir}_{lon_deg}-{lon_min}{lon_dir}"
+            key = (lat_deg, lat_min, lat_dir, lon_deg, lon_min, lon_dir)
             if key not in seen:
                 seen.add(key)
                 lat, _ = parse_coord(lat_deg, lat_min, lat_dir)
@@ -127,7 +117,7 @@ def extract_from_page(text, patrol_num, page_num):
             lon_deg, lon_min = groups[3], groups[4]
             lon_dir = groups[5] if len(groups) > 5 and groups[5] else 'E'  # Default to E
             
-            key = f"{lat_deg}-{lat_min}{lat_dir}_{lon_deg}-{lon_min}{lon_dir}"
+            key = (lat_deg, lat_min, lat_dir, lon_deg, lon_min, lon_dir)
             if key not in seen:
                 seen.add(key)
                 lat, _ = parse_coord(lat_deg, lat_min, lat_dir)
@@ -146,64 +136,30 @@ def extract_from_page(text, patrol_num, page_num):
     return positions
 
 def main():
-    all_positions = []
-    
     print("Extracting positions from patrol reports (v4)...")
     print("=" * 60)
     
-    for report_name, patrol_num in PATROLS:
-        json_path = os.path.join(REPORTS_DIR, f"{report_name}_gv_ocr.json")
-        
-        if not os.path.exists(json_path):
-            print(f"  Patrol {patrol_num}: OCR file not found")
-            continue
-        
-        with open(json_path, 'r', encoding='utf-8') as f:
-            ocr_data = json.load(f)
-        
-        patrol_positions = []
-        for page_str, text in ocr_data.items():
-            page_num = int(page_str)
-            positions = extract_from_page(text, patrol_num, page_num)
-            patrol_positions.extend(positions)
-        
-        print(f"  Patrol {patrol_num}: {len(patrol_positions)} positions")
-        all_positions.extend(patrol_positions)
-    
-    # Sort
-    all_positions.sort(key=lambda x: (x['patrol'], x['page']))
+    all_positions = extract_all(extract_from_page)
     
-    # Remove obvious duplicates and bad data
-    clean = []
-    for p in all_positions:
-        lat, lon = p['latitude'], p['longitude']
-        # Skip impossible coordinates
-        if lat is None or lon is None:
-            continue
-        if abs(lat) > 50:  # Too extreme for Pacific ops
-            continue
-        clean.append(p)
+    # Drop impossible coordinates and sort in one go: sorted() consumes the
+    # filter directly, so only kept rows are sorted and no extra list is built
+    clean = sorted(
+        (p for p in all_positions
+         if p['latitude'] is not None and p['longitude'] is not None
+         and abs(p['latitude']) <= 50),  # Too extreme for Pacific ops
+        key=lambda x: (x['patrol'], x['page'])
+    )
     
     # Write CSV
     csv_path = os.path.join(REPORTS_DIR, "cobia_positions.csv")
-    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=[
-            'patrol', 'page', 'date', 'type',
-            'latitude', 'longitude', 
-            'lat_raw', 'lon_raw', 'issues'
-        ])
-        writer.writeheader()
-        writer.writerows(clean)
+    write_csv(clean, csv_path)
     
     print(f"\n{'=' * 60}")
     print(f"Total positions extracted: {len(all_positions)}")
     print(f"After filtering: {len(clean)}")
     print(f"CSV saved: {csv_path}")
     
-    print("\nBy patrol:")
-    for pn in range(1, 7):
-        cnt = len([p for p in clean if p['patrol'] == pn])
-        print(f"  Patrol {pn}: {cnt} positions")
+    print_patrol_counts(clean)
 
 if __name__ == "__main__":
     main()
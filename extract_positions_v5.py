@@ -6,59 +6,47 @@ Handles multi-line formats where lat and lon are on separate lines.
 
 import os
 import re
-import json
-import csv
+from functools import lru_cache
 
-REPORTS_DIR = "/home/jmknapp/cobia/patrolReports"
-
-PATROLS = [
-    ("USS_Cobia_1st_Patrol_Report", 1),
-    ("USS_Cobia_2nd_Patrol_Report", 2),
-    ("USS_Cobia_3rd_Patrol_Report", 3),
-    ("USS_Cobia_4th_Patrol_Report", 4),
-    ("USS_Cobia_5th_Patrol_Report", 5),
-    ("USS_Cobia_6th_Patrol_Report", 6),
-]
+from coord_core import (
+    REPORTS_DIR, compile_pattern, extract_all, match_date, print_patrol_counts,
+    write_csv,
+)
 
 # Pattern for lat/lon on same line
-SAME_LINE = re.compile(
-    r'(?:Lat\.?\s*)?(\d{1,3})[°\-](\d{1,2}(?:\.\d)?)\s*([NS])\s*(?:Long\.?\s*)?(\d{1,3})[°\-](\d{1,2}(?:\.\d)?)\s*([EW])',
-    re.IGNORECASE
+SAME_LINE = compile_pattern(
+    r'(?:(?i:Lat)\.?\s*)?(\d{1,3})[°\-](\d{1,2}(?:\.\d)?)\s*([NSns])\s*(?:(?i:Long)\.?\s*)?(\d{1,3})[°\-](\d{1,2}(?:\.\d)?)\s*([EWew])'
 )
 
 # Position format with S/E
-POSITION_FMT = re.compile(
+POSITION_FMT = compile_pattern(
     r'Position[:\s]+(\d{1,3})[°\-](\d{1,2}(?:\.\d)?)\s*([NS])\s+(\d{1,3})[°\-](\d{1,2}(?:\.\d)?)\s*([EW])',
     re.IGNORECASE
 )
 
 # Standalone latitude (with N/S attached or space before)
-LAT_PATTERN = re.compile(r'(\d{1,2})[°\-](\d{1,2})\s*([NS])(?:\s|[^0-9EW]|$)', re.IGNORECASE)
+LAT_PATTERN = compile_pattern(r'(\d{1,2})[°\-](\d{1,2})\s*([NSns])(?:\s|[^0-9EWew]|$)')
 
 # Standalone longitude (3 digits often, E/W attached or implied)
-LON_PATTERN = re.compile(r'(\d{2,3})[°\-](\d{1,2})(?:\s*([EW]))?(?:[:\s]|$)', re.IGNORECASE)
-
-DATE_PATTERN = re.compile(
-    r'(January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{1,2})',
-    re.IGNORECASE
-)
+LON_PATTERN = compile_pattern(r'(\d{2,3})[°\-](\d{1,2})(?:\s*([EWew]))?(?:[:\s]|$)')
 
+# The same fixes recur across pages, so parse each raw coordinate only once.
+@lru_cache(maxsize=None)
 def parse_coord(degrees, minutes, direction, is_lon=False):
-    try:
-        deg = int(degrees)
-        min_val = float(minutes)
-        if min_val > 59.9:
-            return None
-        if is_lon and (deg < 100 or deg > 180):
-            return None  # Pacific longitudes are 100-180 E
-        if not is_lon and deg > 60:
-            return None
-        decimal = deg + min_val / 60.0
-        if direction and direction.upper() in ['S', 'W']:
-            decimal = -decimal
-        return round(decimal, 4)
-    except:
+    # Groups come straight from the patterns above, so they are always
+    # digit strings (minutes optionally with one decimal place).
+    deg = int(degrees)
+    min_val = float(minutes) if '.' in minutes else int(minutes)
+    if min_val > 59.9:
         return None
+    if is_lon and (deg < 100 or deg > 180):
+        return None  # Pacific longitudes are 100-180 E
+    if not is_lon and deg > 60:
+        return None
+    decimal = deg + min_val / 60.0
+    if direction and direction.upper() in ['S', 'W']:
+        decimal = -decimal
+    return round(decimal, 4)
 
 def extract_from_page(text, patrol_num, page_num):
     positions = []
@@ -68,14 +56,14 @@ def extract_from_page(text, patrol_num, page_num):
     
     # First pass: same-line patterns
     for line in lines:
-        dm = DATE_PATTERN.search(line)
-        if dm:
-            current_date = f"{dm.group(1)} {dm.group(2)}"
+        date = match_date(line)
+        if date:
+            current_date = date
         
         # Position format
         for m in POSITION_FMT.finditer(line):
             lat_deg, lat_min, lat_dir, lon_deg, lon_min, lon_dir = m.groups()
-            key = f"{lat_deg}-{lat_min}{lat_dir}_{lon_deg}-{lon_min}{lon_dir}"
+            key = (lat_deg, lat_min, lat_dir, lon_deg, lon_min, lon_dir)
             if key not in seen:
                 seen.add(key)
                 lat = parse_coord(lat_deg, lat_min, lat_dir)
@@ -92,18 +80,21 @@ def extract_from_page(text, patrol_num, page_num):
                     })
         
         # Same line lat/lon
+        is_noon = None  # lowered at most once, on the first hit in this line
         for m in SAME_LINE.finditer(line):
             lat_deg, lat_min, lat_dir, lon_deg, lon_min, lon_dir = m.groups()
-            key = f"{lat_deg}-{lat_min}{lat_dir}_{lon_deg}-{lon_min}{lon_dir}"
+            key = (lat_deg, lat_min, lat_dir, lon_deg, lon_min, lon_dir)
             if key not in seen:
                 seen.add(key)
                 lat = parse_coord(lat_deg, lat_min, lat_dir)
                 lon = parse_coord(lon_deg, lon_min, lon_dir, is_lon=True)
                 if lat and lon:
+                    if is_noon is None:
+                        is_noon = "noon" in line.lower()
                     positions.append({
                         'patrol': patrol_num, 'page': page_num,
                         'date': current_date or "",
-                        'type': "Noon" if "noon" in line.lower() else "Position",
+                        'type': "Noon" if is_noon else "Position",
                         'latitude': lat, 'longitude': lon,
                         'lat_raw': f"{lat_deg}-{lat_min}{lat_dir}",
                         'lon_raw': f"{lon_deg}-{lon_min}{lon_dir}",
@@ -123,7 +114,7 @@ def extract_from_page(text, patrol_num, page_num):
                     lon_deg, lon_min, lon_dir = lon_match.groups()
                     lon_dir = lon_dir or 'E'
                     
-                    key = f"{lat_deg}-{lat_min}{lat_dir}_{lon_deg}-{lon_min}{lon_dir}"
+                    key = (lat_deg, lat_min, lat_dir, lon_deg, lon_min, lon_dir)
                     if key not in seen:
                         lat = parse_coord(lat_deg, lat_min, lat_dir)
                         lon = parse_coord(lon_deg, lon_min, lon_dir, is_lon=True)
@@ -143,52 +134,23 @@ def extract_from_page(text, patrol_num, page_num):
     return positions
 
 def main():
-    all_positions = []
-    
     print("Extracting positions from patrol reports (v5)...")
     print("=" * 60)
     
-    for report_name, patrol_num in PATROLS:
-        json_path = os.path.join(REPORTS_DIR, f"{report_name}_gv_ocr.json")
-        
-        if not os.path.exists(json_path):
-            print(f"  Patrol {patrol_num}: OCR file not found")
-            continue
-        
-        with open(json_path, 'r', encoding='utf-8') as f:
-            ocr_data = json.load(f)
-        
-        patrol_positions = []
-        for page_str, text in ocr_data.items():
-            page_num = int(page_str)
-            positions = extract_from_page(text, patrol_num, page_num)
-            patrol_positions.extend(positions)
-        
-        print(f"  Patrol {patrol_num}: {len(patrol_positions)} positions")
-        all_positions.extend(patrol_positions)
+    all_positions = extract_all(extract_from_page)
     
     # Sort and deduplicate
     all_positions.sort(key=lambda x: (x['patrol'], x['page']))
     
     # Write CSV
     csv_path = os.path.join(REPORTS_DIR, "cobia_positions.csv")
-    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=[
-            'patrol', 'page', 'date', 'type',
-            'latitude', 'longitude', 
-            'lat_raw', 'lon_raw', 'issues'
-        ])
-        writer.writeheader()
-        writer.writerows(all_positions)
+    write_csv(all_positions, csv_path)
     
     print(f"\n{'=' * 60}")
     print(f"Total positions: {len(all_positions)}")
     print(f"CSV saved: {csv_path}")
     
-    print("\nBy patrol:")
-    for pn in range(1, 7):
-        cnt = len([p for p in all_positions if p['patrol'] == pn])
-        print(f"  Patrol {pn}: {cnt} positions")
+    print_patrol_counts(all_positions)
 
 if __name__ == "__main__":
     main()
@@ -9,40 +9,50 @@ from docx.shared import Inches, Pt
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.enum.style import WD_STYLE_TYPE
 
+# Single-line block prefixes -> (element type, prefix length). Keys are
+# 2-4 characters long and never prefixes of one another, so a line matches
+# at most one of line[:2], line[:3], line[:4].
+LINE_PREFIXES = {
+    '# ': ('h1', 2),
+    '## ': ('h2', 3),
+    '### ': ('h3', 4),
+    '- ': ('bullet', 2),
+    '  - ': ('bullet2', 4),
+}
+
+# Lines starting with any of these end a running paragraph (as does '---')
+PARA_BREAKS = ('#', '- ', '> ')
+
+# Inline markup: **bold**, *italic*, and [link](url), one group per kind
+INLINE_PATTERN = re.compile(r'\*\*(.*?)\*\*|\*(.*?)\*|\[(.*?)\]\(.*?\)')
+
 def parse_markdown(md_text):
     """Parse markdown text into structured elements."""
     lines = md_text.split('\n')
+    n = len(lines)
     elements = []
     i = 0
     
-    while i < len(lines):
+    while i < n:
         line = lines[i]
+        stripped = line.strip()
         
         # Skip empty lines
-        if not line.strip():
+        if not stripped:
             i += 1
             continue
         
-        # Heading 1
-        if line.startswith('# '):
-            elements.append(('h1', line[2:].strip()))
-            i += 1
-            continue
-        
-        # Heading 2
-        if line.startswith('## '):
-            elements.append(('h2', line[3:].strip()))
-            i += 1
-            continue
-        
-        # Heading 3
-        if line.startswith('### '):
-            elements.append(('h3', line[4:].strip()))
+        # Headings and bullets
+        kind = (LINE_PREFIXES.get(line[:2]) or LINE_PREFIXES.get(line[:3])
+                or LINE_PREFIXES.get(line[:4]))
+        if kind:
+            elem_type, skip = kind
+            elements.append((elem_type, line[skip:].strip()))
             i += 1
             continue
         
         # Horizontal rule
-        if line.strip() == '---':
+        if stripped == '---':
             elements.append(('hr', ''))
             i += 1
             continue
@@ -50,63 +60,57 @@ def parse_markdown(md_text):
         # Blockquote (collect all consecutive blockquote lines)
         if line.startswith('> '):
             quote_lines = []
-            while i < len(lines) and lines[i].startswith('> '):
+            while i < n and lines[i].startswith('> '):
                 quote_lines.append(lines[i][2:])
                 i += 1
             elements.append(('blockquote', ' '.join(quote_lines)))
             continue
         
-        # Bullet list item
-        if line.startswith('- '):
-            elements.append(('bullet', line[2:].strip()))
-            i += 1
-            continue
-        
-        # Indented bullet (sub-item)
-        if line.startswith('  - '):
-            elements.append(('bullet2', line[4:].strip()))
+        # Regular paragraph (collect lines until empty line or special marker).
+        # The first line is always taken so an unrecognised '#...' line can't
+        # stall the loop.
+        para_lines = [line]
+        i += 1
+        while i < n:
+            line = lines[i]
+            stripped = line.strip()
+            if not stripped or stripped == '---' or line.startswith(PARA_BREAKS):
+                break
+            para_lines.append(line)
             i += 1
-            continue
-        
-        # Regular paragraph (collect lines until empty line or special marker)
-        para_lines = []
-        while i < len(lines) and lines[i].strip() and not lines[i].startswith('#') and not lines[i].startswith('- ') and not lines[i].startswith('> ') and lines[i].strip() != '---':
-            para_lines.append(lines[i])
-            i += 1
-        if para_lines:
-            elements.append(('para', ' '.join(para_lines)))
-        continue
+        elements.append(('para', ' '.join(para_lines)))
     
     return elements
 
 def add_formatted_text(paragraph, text):
     """Add text with basic formatting (bold, italic) to a paragraph."""
-    # Pattern to match **bold**, *italic*, and [link](url)
-    pattern = r'(\*\*.*?\*\*|\*.*?\*|\[.*?\]\(.*?\))'
-    parts = re.split(pattern, text)
+    # Most prose has no markup at all: one run, no regex
+    if '*' not in text and '[' not in text:
+        if text:
+            paragraph.add_run(text)
+        return
     
-    for part in parts:
-        if not part:
-            continue
-        if part.startswith('**') and part.endswith('**'):
-            # Bold
-            run = paragraph.add_run(part[2:-2])
+    # Single scan: plain text between matches goes out as-is, and the group
+    # that matched says how to format the markup span.
+    pos = 0
+    for m in INLINE_PATTERN.finditer(text):
+        start = m.start()
+        if start > pos:
+            paragraph.add_run(text[pos:start])
+        bold, italic, link_text = m.group(1, 2, 3)
+        if bold is not None:
+            run = paragraph.add_run(bold)
             run.bold = True
-        elif part.startswith('*') and part.endswith('*') and not part.startswith('**'):
-            # Italic
-            run = paragraph.add_run(part[1:-1])
+        elif italic is not None:
+            run = paragraph.add_run(italic)
             run.italic = True
-        elif part.startswith('[') and '](' in part:
-            # Link - just show the text
-            match = re.match(r'\[(.*?)\]\((.*?)\)', part)
-            if match:
-                link_text = match.group(1)
-                run = paragraph.add_run(link_text)
-                run.underline = True
-            else:
-                paragraph.add_run(part)
         else:
-            paragraph.add_run(part)
+            # Link - just show the text
+            run = paragraph.add_run(link_text)
+            run.underline = True
+        pos = m.end()
+    if pos < len(text):
+        paragraph.add_run(text[pos:])
 
 def create_docx(md_file, output_file):
     """Create a Word document from a markdown file."""
@@ -176,11 +180,3 @@ def create_docx(md_file, output_file):
 
 if __name__ == '__main__':
     create_docx('cobia_story.md', 'cobia_story.docx')
-
-
-
-945:
-
-
-
-
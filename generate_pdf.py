@@ -10,28 +10,42 @@ import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import matplotlib.patheffects as pe
 from matplotlib.patches import Ellipse
-from matplotlib.colors import LinearSegmentedColormap, BoundaryNorm
+from matplotlib.colors import LinearSegmentedColormap, ListedColormap, BoundaryNorm, Normalize, to_rgba
+from matplotlib.collections import LineCollection
 import numpy as np
-import xarray as xr
-import cartopy.crs as ccrs
-import cartopy.feature as cfeature
-from cartopy.mpl.gridliner import LONGITUDE_FORMATTER, LATITUDE_FORMATTER
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.units import inch
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, PageBreak, Table, TableStyle
-from reportlab.lib.colors import HexColor, Color
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
 from io import BytesIO
 import os
 import re
 
+# cartopy, xarray and reportlab are slow to import, so they are imported
+# inside the functions that need them rather than here.
+
+# Map styling shared by both maps, built once at import
+OCEAN_COLORS = ['#e6f3ff', '#cce7ff', '#b3dbff', '#99cfff', '#80c3ff',
+                '#66b7ff', '#4dabff', '#339fff', '#1a93ff', '#0087ff',
+                '#0077e6', '#0066cc', '#0055b3', '#004499', '#003380']
+# Light to dark blue over the full depth range (overview map)
+OCEAN_CMAP = LinearSegmentedColormap.from_list('ocean', OCEAN_COLORS)
+# Lighter blues only, for the shallow water of the detail map
+SHALLOW_OCEAN_CMAP = LinearSegmentedColormap.from_list('ocean', OCEAN_COLORS[:10])
+# White halo that keeps place labels readable over the bathymetry
+TEXT_HALO = [pe.withStroke(linewidth=3, foreground='white')]
+
 # ============================================================
 # LOAD BATHYMETRY DATA
 # ============================================================
 
-def load_bathymetry():
-    """Load ETOPO2022 bathymetry data."""
+@lru_cache(maxsize=1)
+def open_bathymetry():
+    """Open the ETOPO2022 bathymetry file once per process.
+    
+    The Dataset is lazy (nothing but the header is read here) and shared by
+    every map, so callers must not close it.
+    """
+    import xarray as xr
+    
     script_dir = os.path.dirname(os.path.abspath(__file__))
     bathy_file = os.path.join(script_dir, 'south_china_sea_bathymetry.nc')
     
@@ -41,52 +55,108 @@ def load_bathymetry():
             "Run download_bathymetry.py first."
         )
     
-    ds = xr.open_dataset(bathy_file)
-    return ds
+    return xr.open_dataset(bathy_file)
+
+
+def load_bathymetry(extent=None, margin=0.5):
+    """Load ETOPO2022 bathymetry data.
+    
+    With extent=(lon_min, lon_max, lat_min, lat_max) only that window, padded
+    by margin degrees so contours run cleanly off the map edge, is read into
+    memory as float32; otherwise the whole (lazily loaded) dataset is returned.
+    
+    Results are cached per extent, so callers share the returned Dataset and
+    must not close or modify it.
+    """
+    ds = open_bathymetry()
+    if extent is None:
+        return ds
+    
+    lon_min, lon_max, lat_min, lat_max = extent
+    lat_slice = slice(lat_min - margin, lat_max + margin)
+    if ds['lat'][0] > ds['lat'][-1]:  # stored north-to-south
+        lat_slice = slice(lat_slice.stop, lat_slice.start)
+    # Depths only need ~metre precision; keep the window float32 even if the
+    # source decodes to float64 (e.g. via scale_factor)
+    window = ds.sel(lon=slice(lon_min - margin, lon_max + margin), lat=lat_slice)
+    return window.astype('float32').load()
 
 
 # ============================================================
 # MAP GENERATION WITH CARTOPY AND REAL BATHYMETRY
 # ============================================================
 
+@lru_cache(maxsize=1)
+def natural_earth_features():
+    """Return the 50m Natural Earth (land, country borders) features.
+    
+    Built once per process and shared by both maps, so each map doesn't
+    construct (and cartopy doesn't re-resolve) its own feature objects.
+    """
+    import cartopy.feature as cfeature
+    
+    land = cfeature.NaturalEarthFeature('physical', 'land', '50m',
+                                        facecolor='#d4c4a8', edgecolor='none')
+    borders = cfeature.NaturalEarthFeature('cultural', 'admin_0_boundary_lines_land', '50m',
+                                           facecolor='none', edgecolor='#888888',
+                                           linestyle=':')
+    return land, borders
+
+
+def fill_depth_bands(ax, lons, lats, ocean_z, levels, cmap, norm=None, **kwargs):
+    """Shade depth bands with pcolormesh, colored as contourf(extend='min') would.
+    
+    Each band between consecutive levels gets the color contourf gives it
+    (its midpoint through norm/cmap), and anything deeper than levels[0]
+    gets the color of the extended lowest band. A single QuadMesh is much
+    cheaper to build and draw than the contourf polygons.
+    """
+    levels = np.asarray(levels, dtype=float)
+    if norm is None:
+        norm = Normalize(levels[0], levels[-1])
+    layers = np.concatenate([[levels[0] - 1], (levels[:-1] + levels[1:]) / 2])
+    colors = cmap(norm(layers))
+    band_cmap = ListedColormap(colors[1:])
+    band_cmap.set_under(colors[0])
+    return ax.pcolormesh(lons, lats, ocean_z, cmap=band_cmap,
+                         norm=BoundaryNorm(levels, band_cmap.N),
+                         shading='nearest', **kwargs)
+
+
 def create_south_china_sea_map():
     """Create an overview map of the South China Sea with real coastlines and bathymetry."""
     
-    print("  Loading bathymetry data...")
-    ds = load_bathymetry()
+    import cartopy.crs as ccrs
+    from cartopy.mpl.gridliner import LONGITUDE_FORMATTER, LATITUDE_FORMATTER
     
-    fig = plt.figure(figsize=(9, 9))
-    ax = fig.add_subplot(1, 1, 1, projection=ccrs.PlateCarree())
+    pc = ccrs.PlateCarree()  # one CRS instance for every transform below
     
-    # Set map extent [lon_min, lon_max, lat_min, lat_max]
+    # Map extent [lon_min, lon_max, lat_min, lat_max]
     # Zoomed in to show the Vietnamese coast and attack area more clearly
-    ax.set_extent([101, 110, 5, 14], crs=ccrs.PlateCarree())
+    extent = (101, 110, 5, 14)
+    
+    print("  Loading bathymetry data...")
+    ds = load_bathymetry(extent)
+    
+    fig = plt.figure(figsize=(9, 9))
+    ax = fig.add_subplot(1, 1, 1, projection=pc)
+    ax.set_extent(extent, crs=pc)
     
     # Extract bathymetry data for our region
     z = ds['z'].values
     lons = ds['lon'].values
     lats = ds['lat'].values
     
-    # Create meshgrid for plotting
-    lon_grid, lat_grid = np.meshgrid(lons, lats)
-    
     # Mask land (positive values) for ocean coloring
     ocean_z = np.ma.masked_where(z > 0, z)
     
-    # Custom colormap for ocean depth (light to dark blue)
-    ocean_colors = ['#e6f3ff', '#cce7ff', '#b3dbff', '#99cfff', '#80c3ff',
-                    '#66b7ff', '#4dabff', '#339fff', '#1a93ff', '#0087ff',
-                    '#0077e6', '#0066cc', '#0055b3', '#004499', '#003380']
-    ocean_cmap = LinearSegmentedColormap.from_list('ocean', ocean_colors)
-    
     # Define depth levels for coloring
     depth_levels = [-5000, -4000, -3000, -2000, -1500, -1000, -500, -200, -100, -50, 0]
-    norm = BoundaryNorm(depth_levels, ocean_cmap.N, extend='both')
+    norm = BoundaryNorm(depth_levels, OCEAN_CMAP.N, extend='both')
     
-    # Plot ocean bathymetry as filled contours
-    cf = ax.contourf(lon_grid, lat_grid, ocean_z, levels=depth_levels,
-                     cmap=ocean_cmap, norm=norm, transform=ccrs.PlateCarree(),
-                     extend='min', zorder=0)
+    # Plot ocean bathymetry as filled depth bands
+    fill_depth_bands(ax, lons, lats, ocean_z, depth_levels, OCEAN_CMAP,
+                     norm=norm, transform=pc, zorder=0)
     
     # Add bathymetry contour LINES at key depths (must be increasing order)
     contour_depths = [-4000, -3000, -2000, -1000, -500, -200, -100, -50, -37]
@@ -94,9 +164,9 @@ def create_south_china_sea_map():
     contour_widths = [0.5] * 8 + [1.5]  # Thicker for 20-fathom line
     
     # Draw contour lines
-    cs = ax.contour(lon_grid, lat_grid, z, levels=contour_depths,
+    cs = ax.contour(lons, lats, z, levels=contour_depths,
                     colors=contour_colors, linewidths=contour_widths,
-                    linestyles='solid', transform=ccrs.PlateCarree(), zorder=2)
+                    linestyles='solid', transform=pc, zorder=2)
     
     # Label key contours
     label_depths = [-200, -1000, -2000, -3000]
@@ -104,21 +174,15 @@ def create_south_china_sea_map():
               colors='#444444')
     
     # Add land with Natural Earth
-    land = cfeature.NaturalEarthFeature('physical', 'land', '50m',
-                                         facecolor='#d4c4a8', edgecolor='none')
+    land, borders = natural_earth_features()
     ax.add_feature(land, zorder=5)
     
     # Add coastlines
     ax.coastlines(resolution='50m', linewidth=0.8, color='#5d4e37', zorder=6)
     
     # Add country borders
-    borders = cfeature.NaturalEarthFeature('cultural', 'admin_0_boundary_lines_land', '50m',
-                                            facecolor='none', edgecolor='#888888',
-                                            linestyle=':')
     ax.add_feature(borders, linewidth=0.5, zorder=6)
     
-    text_path_effect = [pe.withStroke(linewidth=3, foreground='white')]
-    
     # Key coordinates from the patrol log
     may14_position = (101.53, 9.45)   # 09°27'N, 101°32'E - May 14 depth charging
     initial_contact = (105.33, 8.33)  # 08°20'N, 105°20'E - June 8 radar contact
@@ -130,87 +194,70 @@ def create_south_china_sea_map():
     track_lons = [may14_position[0], initial_contact[0], attack_position[0], end_position[0]]
     track_lats = [may14_position[1], initial_contact[1], attack_position[1], end_position[1]]
     ax.plot(track_lons, track_lats, color='#000066', linestyle='--', linewidth=2.5, 
-            alpha=0.9, transform=ccrs.PlateCarree(), zorder=10)
+            alpha=0.9, transform=pc, zorder=10)
     
     # Mark May 14 depth charging position - simple marker
     ax.scatter(*may14_position, s=120, c='#cc6600', marker='X', 
-               transform=ccrs.PlateCarree(), zorder=12, 
+               transform=pc, zorder=12, 
                edgecolors='#663300', linewidths=1.5)
     ax.text(may14_position[0], may14_position[1]+0.4, 'May 14', fontsize=8, 
             ha='center', color='#804000', fontweight='bold',
-            transform=ccrs.PlateCarree(), zorder=20)
+            transform=pc, zorder=20)
     
     # Mark the attack position with a prominent star
     ax.scatter(*attack_position, s=400, c='#cc0000', marker='*', 
-               transform=ccrs.PlateCarree(), zorder=15, 
+               transform=pc, zorder=15, 
                edgecolors='#660000', linewidths=1.5)
     ax.text(attack_position[0]+0.3, attack_position[1]+0.3, 'ATTACK\nJune 8', fontsize=9, 
             ha='left', color='#990000', fontweight='bold',
-            transform=ccrs.PlateCarree(), zorder=20)
+            transform=pc, zorder=20)
     
     # Mark initial contact - simple
     ax.scatter(*initial_contact, s=100, c='#0066cc', marker='o', 
-               transform=ccrs.PlateCarree(), zorder=12, 
+               transform=pc, zorder=12, 
                edgecolors='#003366', linewidths=1.5)
     ax.text(initial_contact[0]-0.3, initial_contact[1]-0.4, '0310', fontsize=8, 
             ha='right', color='#003366', fontweight='bold',
-            transform=ccrs.PlateCarree(), zorder=20)
+            transform=pc, zorder=20)
     
     # Mark end position - simple
     ax.scatter(*end_position, s=100, c='#006600', marker='s', 
-               transform=ccrs.PlateCarree(), zorder=12,
+               transform=pc, zorder=12,
                edgecolors='#003300', linewidths=1.5)
     ax.text(end_position[0]+0.3, end_position[1], '0830', fontsize=8, 
             ha='left', color='#003300', fontweight='bold',
-            transform=ccrs.PlateCarree(), zorder=20)
+            transform=pc, zorder=20)
     
     # Add place labels - adjusted for zoomed view
-    ax.text(107.5, 12, 'VIETNAM', fontsize=12, fontweight='bold', style='italic',
-            ha='center', color='#3d3d29', transform=ccrs.PlateCarree(),
-            path_effects=text_path_effect, zorder=18)
-    ax.text(107.5, 11.3, '(French Indochina, 1945)', fontsize=9, style='italic',
-            ha='center', color='#5d5d3d', transform=ccrs.PlateCarree(),
-            path_effects=text_path_effect, zorder=18)
-    
-    # Mark key ports - potential convoy destinations
+    # (x, y, text, fontsize, color, extra kwargs)
+    place_labels = [
+        (107.5, 12, 'VIETNAM', 12, '#3d3d29', {'fontweight': 'bold'}),
+        (107.5, 11.3, '(French Indochina, 1945)', 9, '#5d5d3d', {}),
+        (102.5, 8, 'GULF OF\nTHAILAND', 10, '#1a4971', {}),
+        (108.5, 7, 'SOUTH\nCHINA\nSEA', 14, '#003366', {'fontweight': 'bold'}),
+        (110, 19, 'Hainan', 10, '#3d3d29', {}),
+        (101.5, 4, 'MALAY\nPENINSULA', 10, '#3d3d29', {}),
+        (113, 5.5, 'BORNEO', 10, '#3d3d29', {}),
+        (101.9, 13.9, 'THAILAND', 10, '#3d3d29', {'va': 'top'}),
+        (104.5, 12, 'CAMBODIA', 9, '#3d3d29', {}),
+    ]
+    # Clipped to the map: Hainan, Borneo and the Malay Peninsula lie outside
+    # the extent and would otherwise float in the margins
+    for x, y, label, fontsize, color, extra in place_labels:
+        ax.text(x, y, label, fontsize=fontsize, style='italic', ha='center',
+                color=color, transform=pc, clip_on=True,
+                path_effects=TEXT_HALO, zorder=18, **extra)
+    
+    # Mark key ports - potential convoy destinations, one collection for both
     saigon = (106.67, 10.75)  # Saigon (Ho Chi Minh City)
     cap_st_jacques = (107.07, 10.35)  # Cap Saint-Jacques (Vũng Tàu)
     
-    ax.scatter(*saigon, s=80, c='#444444', marker='s', transform=ccrs.PlateCarree(), zorder=12)
+    ax.scatter([saigon[0], cap_st_jacques[0]], [saigon[1], cap_st_jacques[1]],
+               s=[80, 60], c='#444444', marker='s', transform=pc, zorder=12)
     ax.text(saigon[0]+0.3, saigon[1]+0.2, 'Saigon', fontsize=9, fontweight='bold',
-            color='#333333', transform=ccrs.PlateCarree(), zorder=18)
-    
-    ax.scatter(*cap_st_jacques, s=60, c='#444444', marker='s', transform=ccrs.PlateCarree(), zorder=12)
+            color='#333333', transform=pc, zorder=18)
     ax.text(cap_st_jacques[0]+0.3, cap_st_jacques[1], 'Cap St-Jacques', fontsize=8,
-            color='#333333', transform=ccrs.PlateCarree(), zorder=18)
-    
-    ax.text(102.5, 8, 'GULF OF\nTHAILAND', fontsize=10, style='italic', 
-            ha='center', color='#1a4971', transform=ccrs.PlateCarree(),
-            path_effects=text_path_effect, zorder=18)
-    
-    ax.text(108.5, 7, 'SOUTH\nCHINA\nSEA', fontsize=14, style='italic', fontweight='bold',
-            ha='center', color='#003366', transform=ccrs.PlateCarree(),
-            path_effects=text_path_effect, zorder=18)
-    
-    ax.text(110, 19, 'Hainan', fontsize=10, style='italic', 
-            ha='center', color='#3d3d29', transform=ccrs.PlateCarree(),
-            path_effects=text_path_effect, zorder=18)
-    
-    ax.text(101.5, 4, 'MALAY\nPENINSULA', fontsize=10, style='italic',
-            ha='center', color='#3d3d29', transform=ccrs.PlateCarree(),
-            path_effects=text_path_effect, zorder=18)
-    
-    ax.text(113, 5.5, 'BORNEO', fontsize=10, style='italic',
-            ha='center', color='#3d3d29', transform=ccrs.PlateCarree(),
-            path_effects=text_path_effect, zorder=18)
-    
-    ax.text(101.5, 14, 'THAILAND', fontsize=10, style='italic',
-            ha='center', color='#3d3d29', transform=ccrs.PlateCarree(),
-            path_effects=text_path_effect, zorder=18)
-    
-    ax.text(104.5, 12, 'CAMBODIA', fontsize=9, style='italic',
-            ha='center', color='#3d3d29', transform=ccrs.PlateCarree(),
-            path_effects=text_path_effect, zorder=18)
+            color='#333333', transform=pc, zorder=18)
     
     # Add gridlines
     gl = ax.gridlines(draw_labels=True, linewidth=0.5, color='gray', 
@@ -239,10 +286,9 @@ def create_south_china_sea_map():
     plt.tight_layout()
     
     buf = BytesIO()
-    plt.savefig(buf, format='png', dpi=180, bbox_inches='tight', facecolor='white')
+    plt.savefig(buf, format='png', dpi=180, facecolor='white')
     buf.seek(0)
     plt.close()
-    ds.close()
     
     return buf
 
@@ -259,70 +305,77 @@ def create_night_scene():
     ax.axis('off')
     
     # Create gradient sky with STRONG lightning illumination
-    # The lightning flash creates a bright glow that backlights the ships
-    sky_gradient = np.zeros((200, 200, 3))
+    # The lightning flash creates a bright glow that backlights the ships.
+    # i counts rows up from the horizon, j columns left to right.
+    i = np.arange(200)[:, None]
+    j = np.arange(200)[None, :]
     lightning_center_x, lightning_center_y = 140, 140  # Center of lightning glow
     
-    for i in range(200):
-        for j in range(200):
-            # Base sky - darker at top, lighter at horizon
-            base_brightness = 0.05 + (i / 200) * 0.15
-            
-            # Strong lightning glow - radial gradient from lightning position
-            dist = np.sqrt((j - lightning_center_x)**2 + ((i - lightning_center_y) * 0.7)**2)
-            lightning_glow = max(0, 1.0 - dist / 120) * 0.7
-            
-            # Strong horizon illumination from lightning flash
-            if i > 100:  # Lower part of sky near horizon
-                horizon_boost = ((i - 100) / 100) ** 0.5 * 0.5
-                # Spread across most of the sky
-                horizontal_falloff = max(0, 1 - abs(j - 120) / 150)
-                lightning_glow += horizon_boost * horizontal_falloff
-            
-            brightness = base_brightness + lightning_glow
-            brightness = min(brightness, 0.85)  # Cap brightness
-            
-            # Bluish-white tint for lightning illumination
-            sky_gradient[199-i, j] = [
-                brightness * 0.8,   # R
-                brightness * 0.85,  # G  
-                brightness * 1.0    # B
-            ]
+    # Base sky - darker at top, lighter at horizon
+    base_brightness = 0.05 + (i / 200) * 0.15
+    
+    # Strong lightning glow - radial gradient from lightning position
+    dist = np.sqrt((j - lightning_center_x)**2 + ((i - lightning_center_y) * 0.7)**2)
+    lightning_glow = np.maximum(0, 1.0 - dist / 120) * 0.7
+    
+    # Strong horizon illumination from lightning flash in the lower part of
+    # the sky near the horizon, spread across most of the sky
+    horizon_boost = np.sqrt(np.maximum(i - 100, 0) / 100) * 0.5
+    horizontal_falloff = np.maximum(0, 1 - np.abs(j - 120) / 150)
+    lightning_glow = lightning_glow + horizon_boost * horizontal_falloff
+    
+    brightness = np.minimum(base_brightness + lightning_glow, 0.85)  # Cap brightness
+    
+    # Bluish-white tint for lightning illumination, applied to all three
+    # channels in one broadcast multiply; rows flipped so the horizon ends
+    # up at the bottom of the image
+    sky_gradient = brightness[::-1, :, None] * np.array([0.8, 0.85, 1.0])  # R, G, B
     
     ax.imshow(sky_gradient, extent=[0, 100, 30, 60], aspect='auto', zorder=0)
     
-    # Ocean - with strong lightning reflection
-    ocean_gradient = np.zeros((100, 200, 3))
-    for i in range(100):
-        for j in range(200):
-            # Base ocean
-            base = 0.06 + (i / 100) * 0.04
-            
-            # Strong lightning reflection on water - bright band near horizon
-            dist_from_horizon = i
-            reflection_strength = max(0, 1 - dist_from_horizon / 40) * 0.4
-            # Spread reflection across center
-            horizontal_spread = max(0, 1 - abs(j - 120) / 120)
-            reflection_strength *= horizontal_spread
-            
-            # Wave texture
-            wave = np.sin(j * 0.15 + i * 0.1) * 0.01
-            
-            brightness = base + reflection_strength + wave
-            ocean_gradient[99-i, j] = [brightness * 0.7, brightness * 0.8, brightness * 1.0]
+    # Ocean - with strong lightning reflection (i counts rows down from the horizon)
+    i = np.arange(100)[:, None]
+    j = np.arange(200)[None, :]
+    
+    # Base ocean
+    base = 0.06 + (i / 100) * 0.04
+    
+    # Strong lightning reflection on water - bright band near horizon,
+    # spread across center
+    reflection_strength = (np.maximum(0, 1 - i / 40) * 0.4
+                           * np.maximum(0, 1 - np.abs(j - 120) / 120))
+    
+    # Wave texture
+    wave = np.sin(j * 0.15 + i * 0.1) * 0.01
+    
+    brightness = base + reflection_strength + wave
+    ocean_gradient = brightness[::-1, :, None] * np.array([0.7, 0.8, 1.0])  # R, G, B
+    
+    # Subtle reflections on water - just dark smudges below each ship, as
+    # (x0, x1, y0, alpha) in data coordinates. Darkening the image itself
+    # gives what an alpha-blended black fill over it would, without the
+    # compositing; the image has 2 columns per x unit and 1 row per 0.3 of
+    # y below the horizon at y=30, so the edges land on pixel boundaries.
+    for x0, x1, y0, alpha in ((49, 60, 28.5, 0.12), (23, 33, 28.8, 0.08),
+                              (77, 82, 28.8, 0.1)):
+        ocean_gradient[:round((30 - y0) / 0.3), x0 * 2:x1 * 2] *= 1 - alpha
     
     ax.imshow(ocean_gradient, extent=[0, 100, 0, 30], aspect='auto', zorder=0)
     
     # Lightning bolt - bright and forked
     lightning_x = np.array([72, 73.5, 71.5, 73, 70.5, 72, 69.5, 71, 69])
     lightning_y = np.array([58, 53, 50, 46, 43, 39, 36, 33, 30])
-    ax.plot(lightning_x, lightning_y, color='#e0e8f8', linewidth=2.5, alpha=0.95, zorder=15)
-    ax.plot(lightning_x, lightning_y, color='#ffffff', linewidth=1, alpha=0.8, zorder=16)
     
     # Lightning branch
     branch_x = [71.5, 74, 76, 77]
     branch_y = [50, 47, 45, 43]
-    ax.plot(branch_x, branch_y, color='#c0c8e0', linewidth=1.5, alpha=0.7, zorder=15)
+    
+    # Bolt glow and branch share a zorder, so draw them as one collection
+    ax.add_collection(LineCollection(
+        [np.column_stack([lightning_x, lightning_y]), np.column_stack([branch_x, branch_y])],
+        colors=[to_rgba('#e0e8f8', 0.95), to_rgba('#c0c8e0', 0.7)],
+        linewidths=[2.5, 1.5], capstyle='projecting', zorder=15))
+    ax.plot(lightning_x, lightning_y, color='#ffffff', linewidth=1, alpha=0.8, zorder=16)
     
     # Clouds - brightly illuminated by lightning
     cloud1_x = [55, 60, 67, 74, 80, 85, 82, 76, 70, 64, 58, 53]
@@ -350,10 +403,14 @@ def create_night_scene():
     funnel1_x = [54.5, 54.7, 55.8, 56, 54.5]
     funnel1_y = [32.5, 33.2, 33.2, 32.5, 32.5]
     
-    # Draw rim light (bright edge) - thin line simulating backlight
-    ax.plot(tanker1_x[1:8], tanker1_y[1:8], color='#7090b0', linewidth=1.5, zorder=6)
-    ax.plot(super1_x[1:5], super1_y[1:5], color='#7090b0', linewidth=1, zorder=6)
-    ax.plot(funnel1_x[1:4], funnel1_y[1:4], color='#7090b0', linewidth=1, zorder=6)
+    # Rim lights (bright edges) - thin lines simulating backlight, collected
+    # as (x, y, color, width) and drawn per zorder as one LineCollection below
+    rim_lights = [
+        (tanker1_x[1:8], tanker1_y[1:8], '#7090b0', 1.5),
+        (super1_x[1:5], super1_y[1:5], '#7090b0', 1),
+        (funnel1_x[1:4], funnel1_y[1:4], '#7090b0', 1),
+        ([55.2, 55.2], [33.2, 34.5], '#6080a0', 0.6),  # mast
+    ]
     
     # Draw tanker 1 as black silhouette
     ax.fill(tanker1_x, tanker1_y, color='#000000', zorder=7)
@@ -361,7 +418,6 @@ def create_night_scene():
     ax.fill(funnel1_x, funnel1_y, color='#000000', zorder=7)
     # Mast - thin line
     ax.plot([55.2, 55.2], [33.2, 34.5], color='#000000', linewidth=1.2, zorder=8)
-    ax.plot([55.2, 55.2], [33.2, 34.5], color='#6080a0', linewidth=0.6, zorder=6)
     
     # Second tanker - further left, similar size (430 feet)
     tanker2_x = [22, 23, 23.5, 26, 33, 34, 34.5, 34, 33, 26, 23.5, 23, 22]
@@ -369,9 +425,11 @@ def create_night_scene():
     super2_x = [26, 26.3, 26.3, 30, 30, 29.7, 26]
     super2_y = [31.3, 31.5, 32.1, 32.1, 31.5, 31.3, 31.3]
     
-    # Dimmer rim light - further from lightning
-    ax.plot(tanker2_x[1:8], tanker2_y[1:8], color='#506070', linewidth=1.2, zorder=5)
-    ax.plot(super2_x[1:5], super2_y[1:5], color='#506070', linewidth=0.8, zorder=5)
+    # Dimmer rim light - further from lightning, drawn behind the others
+    dim_rim_lights = [
+        (tanker2_x[1:8], tanker2_y[1:8], '#506070', 1.2),
+        (super2_x[1:5], super2_y[1:5], '#506070', 0.8),
+    ]
     
     ax.fill(tanker2_x, tanker2_y, color='#000000', zorder=6)
     ax.fill(super2_x, super2_y, color='#000000', zorder=6)
@@ -384,17 +442,22 @@ def create_night_scene():
     super3_y = [30.9, 31.1, 31.5, 31.5, 31.1, 30.9, 30.9]
     
     # Brightest rim - closest to lightning
-    ax.plot(coaster_x[1:8], coaster_y[1:8], color='#8098b8', linewidth=1.3, zorder=6)
-    ax.plot(super3_x[1:5], super3_y[1:5], color='#8098b8', linewidth=1, zorder=6)
+    rim_lights += [
+        (coaster_x[1:8], coaster_y[1:8], '#8098b8', 1.3),
+        (super3_x[1:5], super3_y[1:5], '#8098b8', 1),
+    ]
+    
+    # The ships don't overlap, so each zorder's rims can go out as one artist
+    for rims, zorder in ((dim_rim_lights, 5), (rim_lights, 6)):
+        ax.add_collection(LineCollection(
+            [np.column_stack([x, y]) for x, y, _, _ in rims],
+            colors=[color for _, _, color, _ in rims],
+            linewidths=[width for _, _, _, width in rims],
+            capstyle='projecting', zorder=zorder))
     
     ax.fill(coaster_x, coaster_y, color='#000000', zorder=7)
     ax.fill(super3_x, super3_y, color='#000000', zorder=7)
     
-    # Subtle reflections on water - just dark smudges below each ship
-    ax.fill([49, 60, 60, 49], [30, 30, 28.5, 28.5], color='#000000', alpha=0.12, zorder=1)
-    ax.fill([23, 33, 33, 23], [30, 30, 28.8, 28.8], color='#000000', alpha=0.08, zorder=1)
-    ax.fill([77, 82, 82, 77], [30, 30, 28.8, 28.8], color='#000000', alpha=0.1, zorder=1)
-    
     # Foreground - Cobia's deck edge with more detail
     deck_x = [0, 5, 12, 18, 25, 28, 25]
     deck_y = [0, 3, 4, 3.5, 2, 0, 0]
@@ -424,8 +487,10 @@ def create_night_scene():
     
     plt.tight_layout()
     
+    # 120 dpi still gives ~185 dpi at the 6.5in width the PDF places it at;
+    # the gradients are upsampled from 200px sources, so 180 dpi bought nothing
     buf = BytesIO()
-    plt.savefig(buf, format='png', dpi=180, bbox_inches='tight', 
+    plt.savefig(buf, format='png', dpi=120,
                 facecolor='#050508', edgecolor='none')
     buf.seek(0)
     plt.close()
@@ -436,43 +501,42 @@ def create_night_scene():
 def create_detail_map():
     """Create a detailed map of the attack sequence with bathymetry."""
     
-    print("  Loading bathymetry data for detail map...")
-    ds = load_bathymetry()
+    import cartopy.crs as ccrs
+    from cartopy.mpl.gridliner import LONGITUDE_FORMATTER, LATITUDE_FORMATTER
     
-    fig = plt.figure(figsize=(9, 7))
-    ax = fig.add_subplot(1, 1, 1, projection=ccrs.PlateCarree())
+    pc = ccrs.PlateCarree()  # one CRS instance for every transform below
     
     # Zoom in on attack area
-    ax.set_extent([106.5, 110.5, 7, 10.5], crs=ccrs.PlateCarree())
+    extent = (106.5, 110.5, 7, 10.5)
+    
+    print("  Loading bathymetry data for detail map...")
+    ds = load_bathymetry(extent)
+    
+    fig = plt.figure(figsize=(9, 7))
+    ax = fig.add_subplot(1, 1, 1, projection=pc)
+    ax.set_extent(extent, crs=pc)
     
     # Extract bathymetry data
     z = ds['z'].values
     lons = ds['lon'].values
     lats = ds['lat'].values
-    lon_grid, lat_grid = np.meshgrid(lons, lats)
     
     # Mask land for ocean coloring
     ocean_z = np.ma.masked_where(z > 0, z)
     
-    # Ocean colormap
-    ocean_colors = ['#e6f3ff', '#cce7ff', '#b3dbff', '#99cfff', '#80c3ff',
-                    '#66b7ff', '#4dabff', '#339fff', '#1a93ff', '#0087ff']
-    ocean_cmap = LinearSegmentedColormap.from_list('ocean', ocean_colors)
-    
     # Depth levels for this zoomed view (shallower focus)
     depth_levels = [-500, -200, -100, -50, -37, -20, -10, 0]
     
     # Plot bathymetry
-    cf = ax.contourf(lon_grid, lat_grid, ocean_z, levels=depth_levels,
-                     cmap=ocean_cmap, transform=ccrs.PlateCarree(),
-                     extend='min', zorder=0)
+    fill_depth_bands(ax, lons, lats, ocean_z, depth_levels, SHALLOW_OCEAN_CMAP,
+                     transform=pc, zorder=0)
     
     # Bathymetry contour lines - emphasize the 20-fathom (37m) curve (must be increasing)
     contour_depths = [-200, -100, -50, -37, -20]
-    cs = ax.contour(lon_grid, lat_grid, z, levels=contour_depths,
+    cs = ax.contour(lons, lats, z, levels=contour_depths,
                     colors=['#666666', '#666666', '#666666', '#996633', '#666666'],
                     linewidths=[0.5, 0.5, 0.8, 2.0, 0.5],
-                    linestyles='solid', transform=ccrs.PlateCarree(), zorder=2)
+                    linestyles='solid', transform=pc, zorder=2)
     
     # Label the 20-fathom curve prominently
     ax.clabel(cs, levels=[-37], inline=True, fontsize=8, fmt='37m\n(20 fath.)',
@@ -481,22 +545,19 @@ def create_detail_map():
               colors='#444444')
     
     # Add land and coastlines
-    land = cfeature.NaturalEarthFeature('physical', 'land', '50m',
-                                         facecolor='#d4c4a8', edgecolor='none')
+    land, _ = natural_earth_features()
     ax.add_feature(land, zorder=5)
     ax.coastlines(resolution='50m', linewidth=1, color='#5d4e37', zorder=6)
     
-    text_path_effect = [pe.withStroke(linewidth=3, foreground='white')]
-    
     # First tanker position
     tanker1_pos = (108.62, 8.93)
     ax.scatter(*tanker1_pos, s=500, c='#ff6600', marker='s', 
-               transform=ccrs.PlateCarree(), zorder=10,
+               transform=pc, zorder=10,
                edgecolors='#cc3300', linewidths=2)
     ax.annotate('TANKER #1\n10,000 tons\n\nTorpedoed 0438\nSank slowly (stern up 20 min)\nCrew abandoned ship\nLifeboats visible', 
                 xy=tanker1_pos, xytext=(tanker1_pos[0]+0.5, tanker1_pos[1]+0.45),
                 fontsize=8, ha='left', fontweight='bold',
-                transform=ccrs.PlateCarree(),
+                transform=pc,
                 bbox=dict(boxstyle='round,pad=0.4', facecolor='#fff8dc', 
                          edgecolor='#ff6600', alpha=0.95),
                 zorder=20)
@@ -504,18 +565,18 @@ def create_detail_map():
     # Second tanker - exploded
     tanker2_pos = (108.45, 8.82)
     ax.scatter(*tanker2_pos, s=500, c='#cc0000', marker='s', 
-               transform=ccrs.PlateCarree(), zorder=10,
+               transform=pc, zorder=10,
                edgecolors='#800000', linewidths=2)
     ax.annotate('TANKER #2\n5,000 tons\nAviation gasoline\n\nExploded 0519\n"Most spectacular flash\nI have ever seen"\n—Cdr. Becker', 
                 xy=tanker2_pos, xytext=(tanker2_pos[0]-1.65, tanker2_pos[1]-0.65),
                 fontsize=8, ha='left', fontweight='bold',
-                transform=ccrs.PlateCarree(),
+                transform=pc,
                 bbox=dict(boxstyle='round,pad=0.4', facecolor='#ffe4e1', 
                          edgecolor='#cc0000', alpha=0.95),
                 zorder=20)
     
     # Explosion effect
-    explosion_circle = plt.Circle(tanker2_pos, 0.1, transform=ccrs.PlateCarree(),
+    explosion_circle = plt.Circle(tanker2_pos, 0.1, transform=pc,
                                    color='#ff4400', alpha=0.3, zorder=9)
     ax.add_patch(explosion_circle)
     
@@ -523,26 +584,26 @@ def create_detail_map():
     escape_start = (108.35, 8.88)
     escape_end = (107.8, 9.35)
     ax.annotate('', xy=escape_end, xytext=escape_start,
-                transform=ccrs.PlateCarree(),
+                transform=pc,
                 arrowprops=dict(arrowstyle='->', color='#666666', lw=2.5, ls='--'))
     ax.scatter(*escape_start, s=150, c='#888888', marker='D',
-               transform=ccrs.PlateCarree(), zorder=10,
+               transform=pc, zorder=10,
                edgecolors='#444444', linewidths=1.5)
     ax.text(107.55, 9.55, 'Third target escaped\ntoward minefield\n(200 ft coaster)', 
             fontsize=8, style='italic', color='#555555', ha='center',
-            transform=ccrs.PlateCarree(),
+            transform=pc,
             bbox=dict(boxstyle='round,pad=0.3', facecolor='white', alpha=0.9),
             zorder=20)
     
     # Cobia's position
     cobia_pos = (108.85, 8.75)
     ax.scatter(*cobia_pos, s=300, c='#003399', marker='^', 
-               transform=ccrs.PlateCarree(), zorder=12,
+               transform=pc, zorder=12,
                edgecolors='#001a66', linewidths=2)
     ax.annotate('USS COBIA\n(SS-245)', xy=cobia_pos, 
                 xytext=(cobia_pos[0]+0.2, cobia_pos[1]-0.4),
                 fontsize=10, fontweight='bold', color='#003399',
-                transform=ccrs.PlateCarree(),
+                transform=pc,
                 bbox=dict(boxstyle='round,pad=0.3', facecolor='white', 
                          edgecolor='#003399', alpha=0.95),
                 zorder=20)
@@ -551,18 +612,17 @@ def create_detail_map():
     lifeboat_positions = [
         (108.58, 9.08), (108.65, 9.15), (108.52, 9.12), (108.60, 9.22)
     ]
-    for pos in lifeboat_positions:
-        ax.scatter(*pos, s=50, c='#8b4513', marker='o', 
-                   transform=ccrs.PlateCarree(), zorder=11, alpha=0.8)
+    ax.scatter(*zip(*lifeboat_positions), s=50, c='#8b4513', marker='o', 
+               transform=pc, zorder=11, alpha=0.8)
     
     # Fog/haze
     fog_ellipse = Ellipse((108.58, 9.38), 0.45, 0.35, 
-                          transform=ccrs.PlateCarree(),
+                          transform=pc,
                           facecolor='#aaaaaa', alpha=0.3, zorder=8)
     ax.add_patch(fog_ellipse)
     ax.text(108.58, 9.65, 'Lifeboats drifting\ninto monsoon fog...', 
             fontsize=9, style='italic', color='#5d4037', ha='center',
-            transform=ccrs.PlateCarree(),
+            transform=pc,
             bbox=dict(boxstyle='round,pad=0.3', facecolor='white', alpha=0.85),
             zorder=20)
     
@@ -570,12 +630,12 @@ def create_detail_map():
     withdrawal_lons = [108.85, 108.2, 107.5, 106.8]
     withdrawal_lats = [8.75, 8.3, 7.8, 7.3]
     ax.plot(withdrawal_lons, withdrawal_lats, color='#000066', linestyle='--', 
-            linewidth=2.5, alpha=0.8, transform=ccrs.PlateCarree(), zorder=10)
+            linewidth=2.5, alpha=0.8, transform=pc, zorder=10)
     ax.annotate('Withdrawal to\ndeep water →', 
                 xy=(withdrawal_lons[-1], withdrawal_lats[-1]),
                 xytext=(withdrawal_lons[-1]+0.2, withdrawal_lats[-1]-0.3),
                 fontsize=8, color='#003399', fontweight='bold',
-                transform=ccrs.PlateCarree(),
+                transform=pc,
                 bbox=dict(boxstyle='round,pad=0.2', facecolor='white', alpha=0.9),
                 zorder=20)
     
@@ -614,23 +674,22 @@ def create_detail_map():
     
     # Coast label
     ax.text(109.8, 10, 'Vietnamese\ncoast →', fontsize=8, style='italic',
-            ha='center', color='#5d4e37', transform=ccrs.PlateCarree(),
-            path_effects=text_path_effect, zorder=18)
+            ha='center', color='#5d4e37', transform=pc,
+            path_effects=TEXT_HALO, zorder=18)
     
     # Depth note
     ax.text(107, 7.3, 'Note: Attack occurred in\ndangerously shallow water\n(~50m depth)', 
             fontsize=7, style='italic', ha='left', color='#555555',
-            transform=ccrs.PlateCarree(),
+            transform=pc,
             bbox=dict(boxstyle='round,pad=0.2', facecolor='white', alpha=0.85),
             zorder=18)
     
     plt.tight_layout()
     
     buf = BytesIO()
-    plt.savefig(buf, format='png', dpi=180, bbox_inches='tight', facecolor='white')
+    plt.savefig(buf, format='png', dpi=180, facecolor='white')
     buf.seek(0)
     plt.close()
-    ds.close()
     
     return buf
 
@@ -647,6 +706,12 @@ def read_markdown_file(filepath):
 def markdown_to_paragraphs(md_text):
     """Convert markdown text to a list of styled paragraphs for reportlab."""
     
+    from reportlab.lib.units import inch
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+    from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
+    from reportlab.lib.colors import HexColor, Color
+    
     styles = getSampleStyleSheet()
     
     # Custom styles
@@ -713,11 +778,20 @@ def markdown_to_paragraphs(md_text):
     elements = []
     
     lines = md_text.split('\n')
-    i = 0
     current_para = []
     blockquote_lines = []
     in_blockquote = False
     
+    def flush_para():
+        """Emit the accumulated body paragraph, if any."""
+        # Lines are only accumulated when non-blank, so the text never is.
+        # Inline markdown is converted on the joined text, since bold and
+        # italic runs can wrap across source lines.
+        if current_para:
+            text = ' '.join(current_para)
+            elements.append(Paragraph(convert_inline_markdown(text), body_style))
+            current_para.clear()
+    
     def flush_blockquote():
         """Create a shaded inset box for blockquote content."""
         if not blockquote_lines:
@@ -739,27 +813,23 @@ def markdown_to_paragraphs(md_text):
         ]))
         return table
     
-    while i < len(lines):
-        line = lines[i]
+    for line in lines:
+        # Strip once and dispatch on the first character; only '#' and '*'
+        # look at the raw line, since their markers must start in column 0
+        stripped = line.strip()
+        first = stripped[:1]
         
         # Handle blockquotes (lines starting with >)
-        if line.strip().startswith('>'):
+        if first == '>':
             # First, flush any pending regular paragraph
-            if current_para:
-                text = ' '.join(current_para)
-                if text.strip():
-                    elements.append(Paragraph(convert_inline_markdown(text), body_style))
-                current_para = []
-            
+            flush_para()
             # Extract blockquote content (remove > prefix)
-            quote_content = line.strip()[1:].strip()
-            blockquote_lines.append(quote_content)
+            blockquote_lines.append(stripped[1:].strip())
             in_blockquote = True
-            i += 1
             continue
         
         # If we were in a blockquote and hit a non-blockquote line, flush it
-        if in_blockquote and not line.strip().startswith('>'):
+        if in_blockquote:
             table = flush_blockquote()
             if table:
                 elements.append(Spacer(1, 8))
@@ -768,84 +838,42 @@ def markdown_to_paragraphs(md_text):
             blockquote_lines = []
             in_blockquote = False
         
-        # Skip horizontal rules
-        if line.strip() == '---':
-            if current_para:
-                text = ' '.join(current_para)
-                if text.strip():
-                    elements.append(Paragraph(convert_inline_markdown(text), body_style))
-                current_para = []
-            elements.append(Spacer(1, 12))
-            i += 1
-            continue
+        # Empty line = end of paragraph
+        if not first:
+            flush_para()
         
-        # Main title
-        if line.startswith('# ') and not line.startswith('## '):
-            if current_para:
-                text = ' '.join(current_para)
-                if text.strip():
-                    elements.append(Paragraph(convert_inline_markdown(text), body_style))
-                current_para = []
-            title_text = line[2:].strip()
-            elements.append(Paragraph(title_text, title_style))
-            i += 1
-            continue
+        elif first == '-' and stripped == '---':
+            # Skip horizontal rules
+            flush_para()
+            elements.append(Spacer(1, 12))
         
-        # Subtitle (italic line after title)
-        if line.startswith('*') and line.endswith('*') and not line.startswith('**'):
-            if current_para:
-                text = ' '.join(current_para)
-                if text.strip():
-                    elements.append(Paragraph(convert_inline_markdown(text), body_style))
-                current_para = []
-            subtitle_text = line.strip('*').strip()
-            elements.append(Paragraph(subtitle_text, subtitle_style))
-            i += 1
-            continue
+        elif first == '-' and stripped.startswith('- '):
+            # Bullet points
+            flush_para()
+            elements.append(Paragraph('• ' + convert_inline_markdown(stripped[2:]), bullet_style))
         
-        # Section headers
-        if line.startswith('## '):
-            if current_para:
-                text = ' '.join(current_para)
-                if text.strip():
-                    elements.append(Paragraph(convert_inline_markdown(text), body_style))
-                current_para = []
-            header_text = line[3:].strip()
-            elements.append(Paragraph(header_text, h2_style))
-            i += 1
-            continue
+        elif first == '#' and line.startswith('# '):
+            # Main title
+            flush_para()
+            elements.append(Paragraph(line[2:].strip(), title_style))
         
-        # Bullet points
-        if line.strip().startswith('- '):
-            if current_para:
-                text = ' '.join(current_para)
-                if text.strip():
-                    elements.append(Paragraph(convert_inline_markdown(text), body_style))
-                current_para = []
-            bullet_text = line.strip()[2:]
-            elements.append(Paragraph('• ' + convert_inline_markdown(bullet_text), bullet_style))
-            i += 1
-            continue
+        elif first == '#' and line.startswith('## '):
+            # Section headers
+            flush_para()
+            elements.append(Paragraph(line[3:].strip(), h2_style))
         
-        # Empty line = end of paragraph
-        if line.strip() == '':
-            if current_para:
-                text = ' '.join(current_para)
-                if text.strip():
-                    elements.append(Paragraph(convert_inline_markdown(text), body_style))
-                current_para = []
-            i += 1
-            continue
+        elif (first == '*' and line.startswith('*') and line.endswith('*')
+              and not line.startswith('**')):
+            # Subtitle (italic line after title)
+            flush_para()
+            elements.append(Paragraph(line.strip('*').strip(), subtitle_style))
         
-        # Regular text - accumulate for paragraph
-        current_para.append(line.strip())
-        i += 1
+        else:
+            # Regular text - accumulate for paragraph
+            current_para.append(stripped)
     
     # Don't forget last paragraph
-    if current_para:
-        text = ' '.join(current_para)
-        if text.strip():
-            elements.append(Paragraph(convert_inline_markdown(text), body_style))
+    flush_para()
     
     # Don't forget any trailing blockquote
     if blockquote_lines:
@@ -858,26 +886,53 @@ def markdown_to_paragraphs(md_text):
     return elements
 
 
+# Bold: **text** -> <b>text</b>
+BOLD_PATTERN = re.compile(r'\*\*([^*]+)\*\*')
+# Italic: *text* -> <i>text</i>  (but not if already processed as bold)
+ITALIC_PATTERN = re.compile(r'(?<!\*)\*([^*]+)\*(?!\*)')
+
 def convert_inline_markdown(text):
     """Convert inline markdown (bold, italic) to reportlab XML tags."""
-    # Bold: **text** -> <b>text</b>
-    text = re.sub(r'\*\*([^*]+)\*\*', r'<b>\1</b>', text)
-    # Italic: *text* -> <i>text</i>  (but not if already processed as bold)
-    text = re.sub(r'(?<!\*)\*([^*]+)\*(?!\*)', r'<i>\1</i>', text)
-    return text
+    # Most prose has no markup at all, so skip both regex passes
+    if '*' not in text:
+        return text
+    return ITALIC_PATTERN.sub(r'<i>\1</i>', BOLD_PATTERN.sub(r'<b>\1</b>', text))
+
+
+# Figure builders run by create_pdf, one worker process each
+FIGURE_BUILDERS = {
+    'overview': create_south_china_sea_map,
+    'detail': create_detail_map,
+    'night': create_night_scene,
+}
+
+def _build_figure(name):
+    """Process-pool entry point: build one figure and return its PNG bytes."""
+    return FIGURE_BUILDERS[name]().getvalue()
 
 
 def create_pdf(output_path, md_filepath):
     """Create the complete PDF document."""
     
-    print("Generating maps with cartopy and ETOPO2022 bathymetry...")
-    overview_map = create_south_china_sea_map()
-    print("  Overview map complete.")
-    detail_map = create_detail_map()
-    print("  Detail map complete.")
-    print("  Generating night scene illustration...")
-    night_scene = create_night_scene()
-    print("  Night scene complete.")
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.enums import TA_CENTER
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, PageBreak
+    from reportlab.lib.colors import HexColor
+    
+    # The three figures are independent and each spends seconds in bathymetry
+    # IO, cartopy and savefig, so build them in parallel processes (pyplot
+    # isn't thread-safe, and the Agg backend is set before any worker starts)
+    print("Generating maps with cartopy and ETOPO2022 bathymetry "
+          "and the night scene illustration...")
+    with ProcessPoolExecutor(max_workers=len(FIGURE_BUILDERS)) as executor:
+        figures = dict(zip(FIGURE_BUILDERS,
+                           executor.map(_build_figure, FIGURE_BUILDERS)))
+    overview_map = BytesIO(figures['overview'])
+    detail_map = BytesIO(figures['detail'])
+    night_scene = BytesIO(figures['night'])
+    print("  Maps and night scene complete.")
     
     print("Reading markdown content...")
     md_content = read_markdown_file(md_filepath)
@@ -894,79 +949,76 @@ def create_pdf(output_path, md_filepath):
     
     styles = getSampleStyleSheet()
     
-    # Build story (content list)
-    story = []
-    
     # Convert markdown to paragraphs
     content_elements = markdown_to_paragraphs(md_content)
     
-    # Insert maps after the Sources section
-    map_inserted = False
-    for i, elem in enumerate(content_elements):
-        story.append(elem)
+    # Insert maps after the paragraph that closes the story, found up front
+    insert_at = next((k for k, elem in enumerate(content_elements)
+                      if isinstance(elem, Paragraph)
+                      and 'stayed with him for the rest of his life' in elem.text), None)
+    if insert_at is None:
+        story = content_elements
+    else:
+        story = content_elements[:insert_at + 1]
+        story.append(Spacer(1, 20))
+        
+        # Add map section
+        map_title_style = ParagraphStyle(
+            'MapTitle',
+            parent=styles['Heading2'],
+            fontSize=14,
+            spaceBefore=12,
+            spaceAfter=8,
+            alignment=TA_CENTER,
+            textColor=HexColor('#2c3e50')
+        )
+        
+        story.append(Paragraph("Maps", map_title_style))
+        story.append(Spacer(1, 10))
+        
+        # Overview map
+        story.append(Image(overview_map, width=6.5*inch, height=6.5*inch))
+        story.append(Spacer(1, 8))
+        
+        caption_style = ParagraphStyle(
+            'Caption',
+            parent=styles['Normal'],
+            fontSize=9,
+            alignment=TA_CENTER,
+            textColor=HexColor('#666666'),
+            fontName='Times-Italic'
+        )
+        story.append(Paragraph(
+            "Figure 1: USS Cobia's track on June 8, 1945. Bathymetry contours from ETOPO 2022. "
+            "The brown line marks the 20-fathom (37m) curve—the critical depth limit mentioned in the patrol log.", 
+            caption_style))
+        
+        story.append(PageBreak())
+        
+        # Detail map
+        story.append(Image(detail_map, width=6.5*inch, height=5*inch))
+        story.append(Spacer(1, 8))
+        story.append(Paragraph(
+            "Figure 2: The attack sequence showing the two tanker positions, "
+            "the gasoline explosion, the escaping third target, and the lifeboats "
+            "drifting into monsoon fog. Note the shallow water depth at the attack site.", 
+            caption_style))
+        
+        story.append(PageBreak())
+        
+        # Night scene illustration
+        story.append(Image(night_scene, width=6.5*inch, height=3.9*inch))
+        story.append(Spacer(1, 8))
+        story.append(Paragraph(
+            "Figure 3: Artist's rendering of the initial convoy sighting at 0330. "
+            "In the \"extreme black night,\" the tankers would have been barely visible—"
+            "dark silhouettes against a marginally lighter sky, revealed only in brief "
+            "flashes of monsoon lightning. The view is from Cobia's deck, looking toward "
+            "the horizon where three ships await.", 
+            caption_style))
         
-        # After Sources section, insert the maps
-        if not map_inserted and isinstance(elem, Paragraph):
-            if 'stayed with him for the rest of his life' in elem.text:
-                map_inserted = True
-                story.append(Spacer(1, 20))
-                
-                # Add map section
-                map_title_style = ParagraphStyle(
-                    'MapTitle',
-                    parent=styles['Heading2'],
-                    fontSize=14,
-                    spaceBefore=12,
-                    spaceAfter=8,
-                    alignment=TA_CENTER,
-                    textColor=HexColor('#2c3e50')
-                )
-                
-                story.append(Paragraph("Maps", map_title_style))
-                story.append(Spacer(1, 10))
-                
-                # Overview map
-                story.append(Image(overview_map, width=6.5*inch, height=6.5*inch))
-                story.append(Spacer(1, 8))
-                
-                caption_style = ParagraphStyle(
-                    'Caption',
-                    parent=styles['Normal'],
-                    fontSize=9,
-                    alignment=TA_CENTER,
-                    textColor=HexColor('#666666'),
-                    fontName='Times-Italic'
-                )
-                story.append(Paragraph(
-                    "Figure 1: USS Cobia's track on June 8, 1945. Bathymetry contours from ETOPO 2022. "
-                    "The brown line marks the 20-fathom (37m) curve—the critical depth limit mentioned in the patrol log.", 
-                    caption_style))
-                
-                story.append(PageBreak())
-                
-                # Detail map
-                story.append(Image(detail_map, width=6.5*inch, height=5*inch))
-                story.append(Spacer(1, 8))
-                story.append(Paragraph(
-                    "Figure 2: The attack sequence showing the two tanker positions, "
-                    "the gasoline explosion, the escaping third target, and the lifeboats "
-                    "drifting into monsoon fog. Note the shallow water depth at the attack site.", 
-                    caption_style))
-                
-                story.append(PageBreak())
-                
-                # Night scene illustration
-                story.append(Image(night_scene, width=6.5*inch, height=3.9*inch))
-                story.append(Spacer(1, 8))
-                story.append(Paragraph(
-                    "Figure 3: Artist's rendering of the initial convoy sighting at 0330. "
-                    "In the \"extreme black night,\" the tankers would have been barely visible—"
-                    "dark silhouettes against a marginally lighter sky, revealed only in brief "
-                    "flashes of monsoon lightning. The view is from Cobia's deck, looking toward "
-                    "the horizon where three ships await.", 
-                    caption_style))
-                
-                story.append(PageBreak())
+        story.append(PageBreak())
+        story.extend(content_elements[insert_at + 1:])
     
     # Build PDF
     doc.build(story)
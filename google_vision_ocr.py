@@ -6,39 +6,68 @@ Creates searchable PDFs with embedded text.
 
 import os
 import sys
-import glob
 import json
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
 from google.cloud import vision
 from PIL import Image
 import fitz  # PyMuPDF
 
-COBIA_DIR = "/home/jmknapp/cobia"
-OUTPUT_DIR = os.path.join(COBIA_DIR, "patrolReports")
+from vision_core import (
+    COBIA_DIR, OUTPUT_DIR, REPORTS, OCR_WORKERS, get_vision_client,
+    image_batches, list_page_images, load_cached_ocr, ocr_cache_path,
+    save_cached_ocr,
+)
 
-# Report folders mapping
-REPORTS = [
-    ("cobia_1st_patrol_report", "USS_Cobia_1st_Patrol_Report"),
-    ("cobia_2nd_patrol_report", "USS_Cobia_2nd_Patrol_Report"),
-    ("cobia_3rd_patrol_report", "USS_Cobia_3rd_Patrol_Report"),
-    ("cobia_4th_patrol_report", "USS_Cobia_4th_Patrol_Report"),
-    ("cobia_5th_patrol_report", "USS_Cobia_5th_Patrol_Report"),
-    ("cobia_6th_patrol_report", "USS_Cobia_6th_Patrol_Report"),
-]
-
-def ocr_with_google_vision(image_path):
-    """Run Google Cloud Vision OCR on an image."""
-    client = vision.ImageAnnotatorClient()
-    
-    with open(image_path, 'rb') as f:
-        content = f.read()
-    
-    image = vision.Image(content=content)
-    response = client.document_text_detection(image=image)
-    
-    if response.error.message:
-        raise Exception(response.error.message)
-    
-    return response.full_text_annotation.text
+def ocr_with_google_vision(image_paths):
+    """Run Google Cloud Vision OCR on a batch of images in one request.
+    
+    Pages already in the OCR cache are answered from it; only the rest are
+    sent to Vision, and their results are cached.
+    
+    Returns one result per image: its text, or the Exception that image (or
+    the whole request) failed with.
+    """
+    client = get_vision_client()
+    feature = vision.Feature(type_=vision.Feature.Type.DOCUMENT_TEXT_DETECTION)
+    
+    results = [None] * len(image_paths)
+    pending = []  # (index, cache file) of each page sent to Vision
+    try:
+        requests = []
+        for i, image_path in enumerate(image_paths):
+            with open(image_path, 'rb') as f:
+                content = f.read()
+            
+            cache_file = ocr_cache_path(content)
+            cached = load_cached_ocr(cache_file)
+            if cached is not None:
+                results[i] = cached['text']
+                continue
+            
+            requests.append(vision.AnnotateImageRequest(
+                image=vision.Image(content=content), features=[feature]))
+            pending.append((i, cache_file))
+        
+        if not requests:
+            return results
+        batch_response = client.batch_annotate_images(requests=requests)
+    except Exception as e:
+        return [e if result is None else result for result in results]
+    
+    # Anything that goes wrong reading the responses fails this batch's
+    # remaining pages, not the whole report
+    try:
+        for (i, cache_file), response in zip(pending, batch_response.responses):
+            if response.error.message:
+                results[i] = Exception(response.error.message)
+            else:
+                text = response.full_text_annotation.text
+                save_cached_ocr(cache_file, {'text': text})
+                results[i] = text
+    except Exception as e:
+        return [e if result is None else result for result in results]
+    return results
 
 def process_report(folder_name, output_name):
     """Process a single patrol report."""
@@ -49,8 +78,7 @@ def process_report(folder_name, output_name):
         return False
     
     # Find all images
-    images = sorted(glob.glob(os.path.join(folder_path, "*.jpg")) +
-                   glob.glob(os.path.join(folder_path, "*.png")))
+    images = list_page_images(folder_path)
     
     if not images:
         print(f"  No images found in {folder_path}")
@@ -65,49 +93,57 @@ def process_report(folder_name, output_name):
     # Also save OCR text to JSON for search
     ocr_texts = {}
     
-    for i, img_path in enumerate(images):
-        page_num = i + 1
-        print(f"  Processing page {page_num}/{len(images)}...", end=" ", flush=True)
+    # One Vision request per batch of pages, several in flight on worker
+    # threads (the client is thread-safe; create it before they share it).
+    # Results still arrive in page order, so the PDF - which PyMuPDF must
+    # build from a single thread - is assembled here as each batch returns.
+    get_vision_client()
+    with ThreadPoolExecutor(max_workers=OCR_WORKERS) as executor:
+        ocr_results = chain.from_iterable(executor.map(ocr_with_google_vision, image_batches(images)))
         
-        try:
-            # Get OCR text from Google Vision
-            text = ocr_with_google_vision(img_path)
-            ocr_texts[str(page_num)] = text
-            print(f"({len(text)} chars)", flush=True)
-            
-            # Load image and get dimensions
-            img = Image.open(img_path)
-            img_width, img_height = img.size
-            
-            # Create page with image dimensions
-            page = doc.new_page(width=img_width, height=img_height)
-            
-            # Insert the image
-            page.insert_image(page.rect, filename=img_path)
-            
-            # Insert OCR text as invisible layer
-            if text.strip():
-                fontsize = 11
-                lines = text.split('\n')
-                y_pos = 40
-                for line in lines:
-                    if line.strip():
-                        try:
-                            page.insert_text(
-                                (40, y_pos),
-                                line,
-                                fontsize=fontsize,
-                                render_mode=3  # Invisible
-                            )
-                        except:
-                            pass  # Skip problematic characters
-                    y_pos += fontsize * 1.2
-                    if y_pos > img_height - 40:
-                        break
+        for i, (img_path, text) in enumerate(zip(images, ocr_results)):
+            page_num = i + 1
+            print(f"  Processing page {page_num}/{len(images)}...", end=" ", flush=True)
             
-        except Exception as e:
-            print(f"Error: {e}")
-            ocr_texts[str(page_num)] = ""
+            try:
+                # OCR text from Google Vision (or the error for this page)
+                if isinstance(text, Exception):
+                    raise text
+                ocr_texts[str(page_num)] = text
+                print(f"({len(text)} chars)", flush=True)
+                
+                # Get image dimensions (Image.open only parses the header)
+                with Image.open(img_path) as img:
+                    img_width, img_height = img.size
+                
+                # Create page with image dimensions
+                page = doc.new_page(width=img_width, height=img_height)
+                
+                # Insert the image
+                page.insert_image(page.rect, filename=img_path)
+                
+                # Insert OCR text as invisible layer, one line per 1.2 font
+                # sizes down to the bottom margin. The lines are collected in
+                # one TextWriter and written together; a line that can't be
+                # added is skipped on its own.
+                if text.strip():
+                    fontsize = 11
+                    writer = fitz.TextWriter(page.rect)
+                    y_pos = 40
+                    for line in text.split('\n'):
+                        if line.strip():
+                            try:
+                                writer.append((40, y_pos), line, fontsize=fontsize)
+                            except Exception:
+                                pass  # Skip problematic characters
+                        y_pos += fontsize * 1.2
+                        if y_pos > img_height - 40:
+                            break
+                    writer.write_text(page, render_mode=3)  # Invisible
+                
+            except Exception as e:
+                print(f"Error: {e}")
+                ocr_texts[str(page_num)] = ""
     
     # Save PDF
     doc.save(output_pdf)
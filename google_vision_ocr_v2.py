@@ -6,57 +6,106 @@ Creates searchable PDFs with text positioned at correct locations.
 
 import os
 import sys
-import glob
 import json
+from itertools import chain, islice
+from concurrent.futures import ThreadPoolExecutor
 from google.cloud import vision
 from PIL import Image
+import numpy as np
 import fitz  # PyMuPDF
 
-COBIA_DIR = "/home/jmknapp/cobia"
-OUTPUT_DIR = os.path.join(COBIA_DIR, "patrolReports")
+from vision_core import (
+    COBIA_DIR, OUTPUT_DIR, REPORTS, OCR_WORKERS, get_vision_client,
+    image_batches, list_page_images, load_cached_ocr, ocr_cache_path,
+    save_cached_ocr,
+)
 
-REPORTS = [
-    ("cobia_1st_patrol_report", "USS_Cobia_1st_Patrol_Report"),
-    ("cobia_2nd_patrol_report", "USS_Cobia_2nd_Patrol_Report"),
-    ("cobia_3rd_patrol_report", "USS_Cobia_3rd_Patrol_Report"),
-    ("cobia_4th_patrol_report", "USS_Cobia_4th_Patrol_Report"),
-    ("cobia_5th_patrol_report", "USS_Cobia_5th_Patrol_Report"),
-    ("cobia_6th_patrol_report", "USS_Cobia_6th_Patrol_Report"),
-]
+def ocr_with_google_vision(image_paths):
+    """Run Google Cloud Vision OCR on a batch of images in one request.
+    
+    Pages already in the OCR cache are answered from it; only the rest are
+    sent to Vision, and their results are cached.
+    
+    Returns one result per image: (full_text, words), or the Exception that
+    image (or the whole request) failed with.
+    """
+    client = get_vision_client()
+    feature = vision.Feature(type_=vision.Feature.Type.DOCUMENT_TEXT_DETECTION)
+    
+    results = [None] * len(image_paths)
+    pending = []  # (index, cache file) of each page sent to Vision
+    try:
+        requests = []
+        for i, image_path in enumerate(image_paths):
+            with open(image_path, 'rb') as f:
+                content = f.read()
+            
+            cache_file = ocr_cache_path(content)
+            cached = load_cached_ocr(cache_file)
+            if cached is not None and 'words' in cached:
+                results[i] = (cached['text'], cached['words'])
+                continue
+            
+            requests.append(vision.AnnotateImageRequest(
+                image=vision.Image(content=content), features=[feature]))
+            pending.append((i, cache_file))
+        
+        if not requests:
+            return results
+        batch_response = client.batch_annotate_images(requests=requests)
+    except Exception as e:
+        return [e if result is None else result for result in results]
+    
+    # Anything that goes wrong reading the responses fails this batch's
+    # remaining pages, not the whole report
+    try:
+        for (i, cache_file), response in zip(pending, batch_response.responses):
+            if response.error.message:
+                results[i] = Exception(response.error.message)
+            else:
+                full_text, words = read_annotation(response)
+                save_cached_ocr(cache_file, {'text': full_text, 'words': words})
+                results[i] = (full_text, words)
+    except Exception as e:
+        return [e if result is None else result for result in results]
+    return results
 
-def ocr_with_google_vision(image_path):
-    """Run Google Cloud Vision OCR, returning words with positions."""
-    client = vision.ImageAnnotatorClient()
-    
-    with open(image_path, 'rb') as f:
-        content = f.read()
-    
-    image = vision.Image(content=content)
-    response = client.document_text_detection(image=image)
-    
-    if response.error.message:
-        raise Exception(response.error.message)
-    
+# Words Vision is less sure of than this are left out of the invisible text
+# layer: they are mostly noise, and each one costs a text operator in the
+# page's content stream
+MIN_WORD_CONFIDENCE = 0.3
+
+def read_annotation(response):
+    """Return (full_text, words with positions) from one image's response."""
     full_text = response.full_text_annotation.text if response.full_text_annotation else ""
     
-    words = []
+    # Read each word's 4 box corners once (proto attribute access is the
+    # slow part), then take every word's min/max corner in one reduction
+    texts = []
+    confidences = []
+    corners = []
     if response.full_text_annotation:
         for page in response.full_text_annotation.pages:
             for block in page.blocks:
                 for paragraph in block.paragraphs:
                     for word in paragraph.words:
-                        word_text = ''.join([s.text for s in word.symbols])
                         vertices = word.bounding_box.vertices
                         if len(vertices) >= 4:
-                            x = min(v.x for v in vertices)
-                            y = min(v.y for v in vertices)
-                            x2 = max(v.x for v in vertices)
-                            y2 = max(v.y for v in vertices)
-                            words.append({
-                                'text': word_text,
-                                'x': x, 'y': y, 'x2': x2, 'y2': y2,
-                                'height': y2 - y
-                            })
+                            texts.append(''.join([s.text for s in word.symbols]))
+                            confidences.append(word.confidence)
+                            for v in islice(vertices, 4):
+                                corners.append((v.x, v.y))
+    
+    boxes = np.array(corners, dtype=np.int64).reshape(-1, 4, 2)
+    mins = boxes.min(axis=1).tolist()
+    maxs = boxes.max(axis=1).tolist()
+    
+    words = [{
+        'text': word_text,
+        'x': x, 'y': y, 'x2': x2, 'y2': y2,
+        'height': y2 - y,
+        'conf': conf
+    } for word_text, conf, (x, y), (x2, y2) in zip(texts, confidences, mins, maxs)]
     
     return full_text, words
 
@@ -67,8 +116,7 @@ def process_report(folder_name, output_name):
         print(f"  Folder not found: {folder_path}")
         return False
     
-    images = sorted(glob.glob(os.path.join(folder_path, "*.jpg")) +
-                   glob.glob(os.path.join(folder_path, "*.png")))
+    images = list_page_images(folder_path)
     
     if not images:
         return False
@@ -79,41 +127,58 @@ def process_report(folder_name, output_name):
     doc = fitz.open()
     ocr_texts = {}
     
-    for i, img_path in enumerate(images):
-        page_num = i + 1
-        print(f"  Page {page_num}/{len(images)}...", end=" ", flush=True)
+    # One Vision request per batch of pages, several in flight on worker
+    # threads (the client is thread-safe; create it before they share it).
+    # Results still arrive in page order, so the PDF - which PyMuPDF must
+    # build from a single thread - is assembled here as each batch returns.
+    get_vision_client()
+    with ThreadPoolExecutor(max_workers=OCR_WORKERS) as executor:
+        ocr_results = chain.from_iterable(executor.map(ocr_with_google_vision, image_batches(images)))
         
-        try:
-            full_text, words = ocr_with_google_vision(img_path)
-            ocr_texts[str(page_num)] = full_text
-            print(f"({len(words)} words)", flush=True)
-            
-            img = Image.open(img_path)
-            img_width, img_height = img.size
-            
-            page = doc.new_page(width=img_width, height=img_height)
-            page.insert_image(page.rect, filename=img_path)
-            
-            for word_info in words:
-                try:
-                    word_text = word_info['text']
-                    x = word_info['x']
-                    y = word_info['y2']
-                    height = word_info['height']
-                    fontsize = max(6, min(24, int(height * 0.8)))
-                    
-                    page.insert_text(
-                        (x, y),
-                        word_text,
-                        fontsize=fontsize,
-                        render_mode=3
-                    )
-                except:
-                    pass
+        for i, (img_path, result) in enumerate(zip(images, ocr_results)):
+            page_num = i + 1
+            print(f"  Page {page_num}/{len(images)}...", end=" ", flush=True)
             
-        except Exception as e:
-            print(f"Error: {e}")
-            ocr_texts[str(page_num)] = ""
+            try:
+                if isinstance(result, Exception):
+                    raise result
+                full_text, words = result
+                ocr_texts[str(page_num)] = full_text
+                print(f"({len(words)} words)", flush=True)
+                
+                # Image dimensions (Image.open only parses the header)
+                with Image.open(img_path) as img:
+                    img_width, img_height = img.size
+                
+                page = doc.new_page(width=img_width, height=img_height)
+                page.insert_image(page.rect, filename=img_path)
+                
+                # Collect every word in one TextWriter and write them to the
+                # page together, instead of one insert_text (and content
+                # stream update) per word
+                writer = fitz.TextWriter(page.rect)
+                # Font size ~80% of each word's box height, clamped to 6-24pt,
+                # for the whole page at once
+                heights = np.array([word_info['height'] for word_info in words])
+                fontsizes = np.clip((heights * 0.8).astype(np.int64), 6, 24).tolist()
+                for word_info, fontsize in zip(words, fontsizes):
+                    # Cache entries written before confidences were kept have
+                    # no 'conf'; keep those words as before
+                    if word_info.get('conf', 1.0) < MIN_WORD_CONFIDENCE:
+                        continue
+                    try:
+                        word_text = word_info['text']
+                        x = word_info['x']
+                        y = word_info['y2']
+                        
+                        writer.append((x, y), word_text, fontsize=fontsize)
+                    except Exception:
+                        pass
+                writer.write_text(page, render_mode=3)
+                
+            except Exception as e:
+                print(f"Error: {e}")
+                ocr_texts[str(page_num)] = ""
     
     doc.save(output_pdf)
     doc.close()
@@ -2,25 +2,60 @@
 """OCR the Muster Rolls PDF with Google Cloud Vision."""
 
 import os
-import io
 import json
 import fitz
+from functools import lru_cache
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
 from google.cloud import vision
-from PIL import Image
 
 SOURCE_PDF = "/home/jmknapp/cobia/patrolReports/USS_Cobia_SS245_Muster_Rolls_1944-1946.pdf"
 OUTPUT_DIR = "/home/jmknapp/cobia/patrolReports"
 BASE_NAME = "USS_Cobia_SS245_Muster_Rolls_1944-1946"
 
-def ocr_image_bytes(image_bytes):
-    """Run Google Cloud Vision OCR on image bytes."""
-    client = vision.ImageAnnotatorClient()
-    image = vision.Image(content=image_bytes)
-    response = client.document_text_detection(image=image)
+# batch_annotate_images takes at most 16 images, and the request itself is
+# size-limited, so batches are capped on both counts
+BATCH_SIZE = 16
+BATCH_BYTES = 8 * 1024 * 1024
+# Vision requests in flight at once; each thread just waits on its gRPC call
+OCR_WORKERS = 16
+
+@lru_cache(maxsize=1)
+def get_vision_client():
+    """Create the Vision client (gRPC channel, credentials) once per run."""
+    return vision.ImageAnnotatorClient()
+
+def ocr_image_batch(images):
+    """Run Google Cloud Vision OCR on a batch of page images (bytes) in one request.
     
-    if response.error.message:
-        raise Exception(response.error.message)
+    Returns one result per image: (full_text, words), or the Exception that
+    image (or the whole request) failed with.
+    """
+    client = get_vision_client()
+    feature = vision.Feature(type_=vision.Feature.Type.DOCUMENT_TEXT_DETECTION)
+    requests = [vision.AnnotateImageRequest(image=vision.Image(content=image_bytes),
+                                            features=[feature])
+                for image_bytes in images]
+    try:
+        batch_response = client.batch_annotate_images(requests=requests)
+    except Exception as e:
+        return [e] * len(images)
     
+    # Anything that goes wrong reading the responses fails this batch's
+    # remaining pages, not the whole run
+    results = []
+    try:
+        for response in batch_response.responses:
+            if response.error.message:
+                results.append(Exception(response.error.message))
+            else:
+                results.append(read_annotation(response))
+    except Exception as e:
+        return results + [e] * (len(images) - len(results))
+    return results
+
+def read_annotation(response):
+    """Return (full_text, words with positions) from one image's response."""
     full_text = response.full_text_annotation.text if response.full_text_annotation else ""
     
     # Extract words with positions
@@ -30,12 +65,16 @@ def ocr_image_bytes(image_bytes):
             for block in page.blocks:
                 for paragraph in block.paragraphs:
                     for word in paragraph.words:
+                        if not word.symbols:
+                            continue
                         word_text = ''.join([s.text for s in word.symbols])
                         vertices = word.bounding_box.vertices
                         if len(vertices) >= 4:
-                            x = min(v.x for v in vertices)
-                            y = min(v.y for v in vertices)
-                            y2 = max(v.y for v in vertices)
+                            # Read each corner's x and y once (proto attribute
+                            # access is the slow part), then reduce the lists
+                            xs = [v.x for v in vertices]
+                            ys = [v.y for v in vertices]
+                            x, y, y2 = min(xs), min(ys), max(ys)
                             words.append({
                                 'text': word_text,
                                 'x': x, 'y': y, 'y2': y2,
@@ -57,54 +96,75 @@ def main():
     new_doc = fitz.open()
     ocr_texts = {}
     
-    for page_num in range(num_pages):
-        print(f"  Page {page_num + 1}/{num_pages}...", end=" ", flush=True)
-        
-        page = doc[page_num]
-        
-        # Render page to image at higher resolution for OCR
-        mat = fitz.Matrix(2.0, 2.0)  # 2x scale for better OCR
-        pix = page.get_pixmap(matrix=mat)
+    # Pages are rendered here, one at a time (a MuPDF document can't be
+    # used from several threads), and batched into batch_annotate_images
+    # requests; each batch is sent on a worker thread as soon as it is full,
+    # so the network round trips overlap with each other and with the
+    # rendering. The client is thread-safe; create it before the workers
+    # share it.
+    get_vision_client()
+    with ThreadPoolExecutor(max_workers=OCR_WORKERS) as executor:
+        batch_futures = []
+        batch, batch_bytes = [], 0
+        for page_num in range(num_pages):
+            page = doc[page_num]
+            
+            # Render page to image at higher resolution for OCR
+            mat = fitz.Matrix(2.0, 2.0)  # 2x scale for better OCR
+            pix = page.get_pixmap(matrix=mat)
+            
+            # Convert to bytes for OCR
+            img_bytes = pix.tobytes("png")
+            
+            if batch and (len(batch) == BATCH_SIZE or batch_bytes + len(img_bytes) > BATCH_BYTES):
+                batch_futures.append(executor.submit(ocr_image_batch, batch))
+                batch, batch_bytes = [], 0
+            batch.append(img_bytes)
+            batch_bytes += len(img_bytes)
+        if batch:
+            batch_futures.append(executor.submit(ocr_image_batch, batch))
         
-        # Convert to bytes for OCR
-        img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-        img_bytes = io.BytesIO()
-        img.save(img_bytes, format="PNG")
-        img_bytes = img_bytes.getvalue()
+        ocr_results = chain.from_iterable(future.result() for future in batch_futures)
         
-        try:
-            # OCR with Google Vision
-            full_text, words = ocr_image_bytes(img_bytes)
-            ocr_texts[str(page_num + 1)] = full_text
-            print(f"({len(words)} words)")
-            
-            # Create new page with original dimensions
-            new_page = new_doc.new_page(width=page.rect.width, height=page.rect.height)
+        # Assemble the new PDF in page order as the OCR results come back
+        for page_num, result in enumerate(ocr_results):
+            print(f"  Page {page_num + 1}/{num_pages}...", end=" ", flush=True)
             
-            # Copy original page content
-            new_page.show_pdf_page(new_page.rect, doc, page_num)
+            page = doc[page_num]
             
-            # Add OCR text layer (scaled back from 2x)
-            scale = 0.5  # Because we rendered at 2x
-            for word_info in words:
-                try:
-                    x = word_info['x'] * scale
-                    y = word_info['y2'] * scale
-                    height = word_info['height'] * scale
-                    fontsize = max(4, int(height * 0.8))
-                    
-                    new_page.insert_text(
-                        (x, y),
-                        word_info['text'],
-                        fontsize=fontsize,
-                        render_mode=3  # Invisible
-                    )
-                except:
-                    pass
-                    
-        except Exception as e:
-            print(f"Error: {e}")
-            ocr_texts[str(page_num + 1)] = ""
+            try:
+                # OCR with Google Vision (or the error for this page)
+                if isinstance(result, Exception):
+                    raise result
+                full_text, words = result
+                ocr_texts[str(page_num + 1)] = full_text
+                print(f"({len(words)} words)")
+                
+                # Create new page with original dimensions
+                new_page = new_doc.new_page(width=page.rect.width, height=page.rect.height)
+                
+                # Copy original page content
+                new_page.show_pdf_page(new_page.rect, doc, page_num)
+                
+                # Add OCR text layer (scaled back from 2x), collected in one
+                # TextWriter and written to the page together
+                scale = 0.5  # Because we rendered at 2x
+                writer = fitz.TextWriter(new_page.rect)
+                for word_info in words:
+                    try:
+                        x = word_info['x'] * scale
+                        y = word_info['y2'] * scale
+                        height = word_info['height'] * scale
+                        fontsize = max(4, int(height * 0.8))
+                        
+                        writer.append((x, y), word_info['text'], fontsize=fontsize)
+                    except:
+                        pass
+                writer.write_text(new_page, render_mode=3)  # Invisible
+                        
+            except Exception as e:
+                print(f"Error: {e}")
+                ocr_texts[str(page_num + 1)] = ""
     
     doc.close()
     
@@ -145,16 +205,14 @@ def create_web_version(input_pdf):
         pix = page.get_pixmap(matrix=mat)
         
         # Convert to JPEG
-        img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-        img_bytes = io.BytesIO()
-        img.save(img_bytes, format="JPEG", quality=JPEG_QUALITY)
-        img_bytes.seek(0)
+        img_bytes = pix.tobytes("jpeg", jpg_quality=JPEG_QUALITY)
         
         # Create new page
         new_page = new_doc.new_page(width=new_width, height=new_height)
-        new_page.insert_image(new_page.rect, stream=img_bytes.read())
+        new_page.insert_image(new_page.rect, stream=img_bytes)
         
         # Scale text layer
+        writer = fitz.TextWriter(new_page.rect)
         text_dict = page.get_text("dict")
         for block in text_dict.get("blocks", []):
             if block.get("type") == 0:
@@ -166,9 +224,10 @@ def create_web_version(input_pdf):
                             y = span["origin"][1] * scale
                             fontsize = max(4, span["size"] * scale)
                             try:
-                                new_page.insert_text((x, y), text, fontsize=fontsize, render_mode=3)
+                                writer.append((x, y), text, fontsize=fontsize)
                             except:
                                 pass
+        writer.write_text(new_page, render_mode=3)
     
     # Save to pdfs_web
     web_dir = os.path.join(OUTPUT_DIR, "pdfs_web")
@@ -2,25 +2,60 @@
 """OCR the Muster Rolls PDF with Google Cloud Vision - Fixed positioning."""
 
 import os
-import io
 import json
 import fitz
+from functools import lru_cache
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
 from google.cloud import vision
-from PIL import Image
 
 SOURCE_PDF = "/home/jmknapp/cobia/patrolReports/USS_Cobia_SS245_Muster_Rolls_1944-1946.pdf"
 OUTPUT_DIR = "/home/jmknapp/cobia/patrolReports"
 BASE_NAME = "USS_Cobia_SS245_Muster_Rolls_1944-1946"
 
-def ocr_image_bytes(image_bytes):
-    """Run Google Cloud Vision OCR on image bytes."""
-    client = vision.ImageAnnotatorClient()
-    image = vision.Image(content=image_bytes)
-    response = client.document_text_detection(image=image)
+# batch_annotate_images takes at most 16 images, and the request itself is
+# size-limited, so batches are capped on both counts
+BATCH_SIZE = 16
+BATCH_BYTES = 8 * 1024 * 1024
+# Vision requests in flight at once; each thread just waits on its gRPC call
+OCR_WORKERS = 16
+
+@lru_cache(maxsize=1)
+def get_vision_client():
+    """Create the Vision client (gRPC channel, credentials) once per run."""
+    return vision.ImageAnnotatorClient()
+
+def ocr_image_batch(images):
+    """Run Google Cloud Vision OCR on a batch of page images (bytes) in one request.
     
-    if response.error.message:
-        raise Exception(response.error.message)
+    Returns one result per image: (full_text, words), or the Exception that
+    image (or the whole request) failed with.
+    """
+    client = get_vision_client()
+    feature = vision.Feature(type_=vision.Feature.Type.DOCUMENT_TEXT_DETECTION)
+    requests = [vision.AnnotateImageRequest(image=vision.Image(content=image_bytes),
+                                            features=[feature])
+                for image_bytes in images]
+    try:
+        batch_response = client.batch_annotate_images(requests=requests)
+    except Exception as e:
+        return [e] * len(images)
     
+    # Anything that goes wrong reading the responses fails this batch's
+    # remaining pages, not the whole run
+    results = []
+    try:
+        for response in batch_response.responses:
+            if response.error.message:
+                results.append(Exception(response.error.message))
+            else:
+                results.append(read_annotation(response))
+    except Exception as e:
+        return results + [e] * (len(images) - len(results))
+    return results
+
+def read_annotation(response):
+    """Return (full_text, words with positions) from one image's response."""
     full_text = response.full_text_annotation.text if response.full_text_annotation else ""
     
     words = []
@@ -29,12 +64,16 @@ def ocr_image_bytes(image_bytes):
             for block in page.blocks:
                 for paragraph in block.paragraphs:
                     for word in paragraph.words:
+                        if not word.symbols:
+                            continue
                         word_text = ''.join([s.text for s in word.symbols])
                         vertices = word.bounding_box.vertices
                         if len(vertices) >= 4:
-                            x = min(v.x for v in vertices)
-                            y = min(v.y for v in vertices)
-                            y2 = max(v.y for v in vertices)
+                            # Read each corner's x and y once (proto attribute
+                            # access is the slow part), then reduce the lists
+                            xs = [v.x for v in vertices]
+                            ys = [v.y for v in vertices]
+                            x, y, y2 = min(xs), min(ys), max(ys)
                             words.append({
                                 'text': word_text,
                                 'x': x, 'y': y, 'y2': y2,
@@ -54,55 +93,77 @@ def main():
     new_doc = fitz.open()
     ocr_texts = {}
     
-    for page_num in range(num_pages):
-        print(f"  Page {page_num + 1}/{num_pages}...", end=" ", flush=True)
-        
-        page = doc[page_num]
-        page_width = page.rect.width
-        page_height = page.rect.height
-        
-        # Render page at 1:1 (no scaling) - coordinates will match directly
-        pix = page.get_pixmap()
-        render_width = pix.width
-        render_height = pix.height
+    # Pages are rendered here, one at a time (a MuPDF document can't be
+    # used from several threads), and batched into batch_annotate_images
+    # requests; each batch is sent on a worker thread as soon as it is full,
+    # so the network round trips overlap with each other and with the
+    # rendering. The client is thread-safe; create it before the workers
+    # share it.
+    get_vision_client()
+    with ThreadPoolExecutor(max_workers=OCR_WORKERS) as executor:
+        batch_futures = []
+        batch, batch_bytes = [], 0
+        for page_num in range(num_pages):
+            page = doc[page_num]
+            
+            # Render page at 1:1 (no scaling) - coordinates will match directly
+            pix = page.get_pixmap()
+            
+            # Convert to bytes for OCR
+            img_bytes = pix.tobytes("png")
+            
+            if batch and (len(batch) == BATCH_SIZE or batch_bytes + len(img_bytes) > BATCH_BYTES):
+                batch_futures.append(executor.submit(ocr_image_batch, batch))
+                batch, batch_bytes = [], 0
+            batch.append(img_bytes)
+            batch_bytes += len(img_bytes)
+        if batch:
+            batch_futures.append(executor.submit(ocr_image_batch, batch))
         
-        # Convert to bytes for OCR
-        img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-        img_bytes = io.BytesIO()
-        img.save(img_bytes, format="PNG")
-        img_bytes = img_bytes.getvalue()
+        ocr_results = chain.from_iterable(future.result() for future in batch_futures)
         
-        try:
-            full_text, words = ocr_image_bytes(img_bytes)
-            ocr_texts[str(page_num + 1)] = full_text
-            print(f"({len(words)} words)")
-            
-            # Create new page at render size (matches OCR coordinates)
-            new_page = new_doc.new_page(width=render_width, height=render_height)
+        # Assemble the new PDF in page order as the OCR results come back.
+        # Only the PNG bytes were kept while queuing, so each page is
+        # rendered again here (cheap next to the Vision round trip) rather
+        # than holding every page's pixmap until the last one is queued.
+        for page_num, result in enumerate(ocr_results):
+            print(f"  Page {page_num + 1}/{num_pages}...", end=" ", flush=True)
             
-            # Insert original page image
-            new_page.insert_image(new_page.rect, pixmap=pix)
+            pix = doc[page_num].get_pixmap()
+            render_width = pix.width
+            render_height = pix.height
             
-            # Add OCR text layer - no scaling needed since we rendered at 1:1
-            for word_info in words:
-                try:
-                    x = word_info['x']
-                    y = word_info['y2']  # Use bottom of bounding box for baseline
-                    height = word_info['height']
-                    fontsize = max(6, min(24, int(height * 0.8)))
-                    
-                    new_page.insert_text(
-                        (x, y),
-                        word_info['text'],
-                        fontsize=fontsize,
-                        render_mode=3  # Invisible
-                    )
-                except:
-                    pass
-                    
-        except Exception as e:
-            print(f"Error: {e}")
-            ocr_texts[str(page_num + 1)] = ""
+            try:
+                if isinstance(result, Exception):
+                    raise result
+                full_text, words = result
+                ocr_texts[str(page_num + 1)] = full_text
+                print(f"({len(words)} words)")
+                
+                # Create new page at render size (matches OCR coordinates)
+                new_page = new_doc.new_page(width=render_width, height=render_height)
+                
+                # Insert original page image
+                new_page.insert_image(new_page.rect, pixmap=pix)
+                
+                # Add OCR text layer - no scaling needed since we rendered at 1:1.
+                # Words are collected in one TextWriter and written together.
+                writer = fitz.TextWriter(new_page.rect)
+                for word_info in words:
+                    try:
+                        x = word_info['x']
+                        y = word_info['y2']  # Use bottom of bounding box for baseline
+                        height = word_info['height']
+                        fontsize = max(6, min(24, int(height * 0.8)))
+                        
+                        writer.append((x, y), word_info['text'], fontsize=fontsize)
+                    except:
+                        pass
+                writer.write_text(new_page, render_mode=3)  # Invisible
+                        
+            except Exception as e:
+                print(f"Error: {e}")
+                ocr_texts[str(page_num + 1)] = ""
     
     doc.close()
     
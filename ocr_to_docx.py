@@ -5,6 +5,7 @@ that preserves the original text layout and formatting.
 """
 
 import sys
+import numpy as np
 import pytesseract
 from PIL import Image
 from docx import Document
@@ -30,69 +31,48 @@ def get_ocr_with_layout(image_path):
 def reconstruct_lines(data, img_width):
     """Reconstruct lines from OCR data, properly grouping words."""
     
-    # Group by block_num, par_num, line_num
-    lines_dict = {}
-    
-    n = len(data['text'])
-    for i in range(n):
-        text = data['text'][i].strip()
-        if not text:
-            continue
-        
-        block = data['block_num'][i]
-        par = data['par_num'][i]
-        line = data['line_num'][i]
-        
-        key = (block, par, line)
-        
-        if key not in lines_dict:
-            lines_dict[key] = {
-                'words': [],
-                'top': data['top'][i],
-                'left': float('inf'),
-                'right': 0
-            }
-        
-        lines_dict[key]['words'].append({
-            'text': text,
-            'left': data['left'][i],
-            'width': data['width'][i],
-            'conf': data['conf'][i]
-        })
-        lines_dict[key]['left'] = min(lines_dict[key]['left'], data['left'][i])
-        lines_dict[key]['right'] = max(lines_dict[key]['right'], data['left'][i] + data['width'][i])
+    # Keep the non-empty words, as arrays in Tesseract's output order
+    texts = [text.strip() for text in data['text']]
+    keep = np.flatnonzero([bool(text) for text in texts])
+    if not keep.size:
+        return []
+    texts = [texts[i] for i in keep]
+    block = np.asarray(data['block_num'])[keep]
+    par = np.asarray(data['par_num'])[keep]
+    line = np.asarray(data['line_num'])[keep]
+    left = np.asarray(data['left'])[keep]
+    top = np.asarray(data['top'])[keep]
+    right = left + np.asarray(data['width'])[keep]
+    
+    # Sort words by (block_num, par_num, line_num), then horizontal position;
+    # lexsort is stable, so words at the same position keep their order.
+    # Each run of equal keys is one line.
+    order = np.lexsort((left, line, par, block))
+    new_line = ((np.diff(block[order]) != 0) | (np.diff(par[order]) != 0)
+                | (np.diff(line[order]) != 0))
     
-    # Convert to list and sort by vertical position
     lines = []
-    for key in sorted(lines_dict.keys()):
-        line_data = lines_dict[key]
-        # Sort words by horizontal position
-        words = sorted(line_data['words'], key=lambda w: w['left'])
-        
-        # Reconstruct line text with spacing
-        line_text = ""
-        prev_right = 0
-        for i, word in enumerate(words):
-            if i == 0:
-                line_text = word['text']
-                prev_right = word['left'] + word['width']
+    for words in np.split(order, np.flatnonzero(new_line) + 1):
+        # Reconstruct line text with spacing: the gap to the previous word
+        # picks a tab, several spaces, or one space
+        gaps = (left[words[1:]] - right[words[:-1]]).tolist()
+        line_text = texts[words[0]]
+        for gap, i in zip(gaps, words[1:].tolist()):
+            if gap > 50:  # Large gap - likely tab
+                line_text += "\t" + texts[i]
+            elif gap > 20:  # Medium gap - multiple spaces
+                spaces = max(2, gap // 10)
+                line_text += " " * spaces + texts[i]
             else:
-                gap = word['left'] - prev_right
-                if gap > 50:  # Large gap - likely tab
-                    line_text += "\t" + word['text']
-                elif gap > 20:  # Medium gap - multiple spaces
-                    spaces = max(2, gap // 10)
-                    line_text += " " * spaces + word['text']
-                else:
-                    line_text += " " + word['text']
-                prev_right = word['left'] + word['width']
+                line_text += " " + texts[i]
         
+        first = words[0]
         lines.append({
             'text': line_text,
-            'left': line_data['left'],
-            'right': line_data['right'],
-            'top': line_data['top'],
-            'key': key
+            'left': int(left[first]),
+            'right': int(right[words].max()),
+            'top': int(top[words.min()]),  # top of the line's first word as read
+            'key': (int(block[first]), int(par[first]), int(line[first]))
         })
     
     # Sort by top position
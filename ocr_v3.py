@@ -5,13 +5,15 @@ from PIL import Image, ImageFilter, ImageEnhance, ImageOps
 import img2pdf
 import cv2
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 
 def preprocess(inp, out):
     # Read with OpenCV for better processing
     img = cv2.imread(inp, cv2.IMREAD_GRAYSCALE)
     
-    # Denoise
-    img = cv2.fastNlMeansDenoising(img, None, 10, 7, 21)
+    # Denoise: a 3x3 median removes the speckle before thresholding at a
+    # tiny fraction of the cost of non-local means
+    img = cv2.medianBlur(img, 3)
     
     # Adaptive threshold (binarization)
     img = cv2.adaptiveThreshold(img, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 10)
@@ -23,12 +25,11 @@ def process(folder, outpdf):
     print(f"Found {len(imgs)} images")
     
     with tempfile.TemporaryDirectory() as tmp:
-        preproc = []
-        for i, p in enumerate(imgs):
-            o = os.path.join(tmp, f"p{i:03d}.png")
-            preprocess(p, o)
-            preproc.append(o)
-            if (i+1) % 10 == 0: print(f"  Preprocessed {i+1}/{len(imgs)}")
+        preproc = [os.path.join(tmp, f"p{i:03d}.png") for i in range(len(imgs))]
+        # Pages are independent: preprocess them on all cores
+        with ProcessPoolExecutor() as ex:
+            for i, _ in enumerate(ex.map(preprocess, imgs, preproc, chunksize=4)):
+                if (i+1) % 10 == 0: print(f"  Preprocessed {i+1}/{len(imgs)}")
         
         print("Creating PDF...")
         tpdf = os.path.join(tmp, "t.pdf")
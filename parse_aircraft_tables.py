@@ -4,14 +4,24 @@ Parse aircraft contact tables from Patrol 1 (pages 22-28).
 The table has columns for each contact, read row by row.
 """
 
-import json
 import re
 
-REPORTS_DIR = "/home/jmknapp/cobia/patrolReports"
+from aircraft_core import MONTHS, TIME_PATTERN, load_ocr
+
+# Patterns are compiled once here rather than for every page and line
+CONTACT_NO_PATTERN = re.compile(r'^(\d{1,2})\.?$')
+SMALL_NUMBER_PATTERN = re.compile(r'^\d{1,2}$')
+# Month names as written (case-sensitive), and dates in any case
+MONTH_NAME_PATTERN = re.compile('|'.join(MONTHS))
+DATE_PATTERN = re.compile(r'(\d{1,2})\s*(' + '|'.join(MONTHS) + ')', re.IGNORECASE)
+# Latitudes and longitudes (DD-MM.MN, DDD-MM.ME), direction often missing
+LAT_PATTERN = re.compile(r'(\d{1,2})-(\d{2})(?:\.(\d))?([NS])?')
+LON_PATTERN = re.compile(r'(\d{2,3})-(\d{2})(?:\.(\d))?([EW])?')
+AC_TYPES = ['PBM', 'PBY', 'Sally', 'Emily', 'Kate', 'Betty', 'Botty', 'Nell']
+AC_TYPE_PATTERNS = [(ac, re.compile(ac, re.IGNORECASE)) for ac in AC_TYPES]
 
 def parse_patrol1_aircraft():
-    with open(f'{REPORTS_DIR}/USS_Cobia_1st_Patrol_Report_gv_ocr.json') as f:
-        ocr = json.load(f)
+    ocr = load_ocr()
     
     contacts = []
     
@@ -59,8 +69,9 @@ def parse_patrol1_aircraft():
                 data_start = i
                 break
             # Also check for numbers with dots like "18."
-            if re.match(r'^\d{1,2}\.?$', line):
-                num = int(re.match(r'^(\d{1,2})', line).group(1))
+            m = CONTACT_NO_PATTERN.match(line)
+            if m:
+                num = int(m.group(1))
                 if num == contact_num + 1:
                     data_start = i
                     break
@@ -69,7 +80,7 @@ def parse_patrol1_aircraft():
             # Try finding by looking for sequence of small numbers
             for i in range(contact_line_idx + 1, min(contact_line_idx + 20, len(lines))):
                 line = lines[i].strip()
-                if re.match(r'^\d{1,2}$', line):
+                if SMALL_NUMBER_PATTERN.match(line):
                     num = int(line)
                     if contact_num < num <= contact_num + 10:
                         data_start = i
@@ -91,58 +102,51 @@ def parse_patrol1_aircraft():
         idx = data_start
         while idx < len(lines) and len(contact_numbers) < num_contacts:
             line = lines[idx].strip()
-            if re.match(r'^\d{1,2}\.?$', line):
-                num = int(re.match(r'^(\d{1,2})', line).group(1))
-                contact_numbers.append(num)
+            m = CONTACT_NO_PATTERN.match(line)
+            if m:
+                contact_numbers.append(int(m.group(1)))
             elif line.isdigit():
                 contact_numbers.append(int(line))
             idx += 1
         
-        # Now look for dates (month names)
-        months = ['January', 'February', 'March', 'April', 'May', 'June', 
-                  'July', 'August', 'September', 'October', 'November', 'December']
-        
-        for i in range(data_start, min(len(lines), data_start + 30)):
-            line = lines[i]
-            for month in months:
-                if month in line:
-                    # Extract all dates from this line
-                    date_matches = re.findall(r'(\d{1,2})\s*(' + '|'.join(months) + ')', line, re.IGNORECASE)
-                    for dm in date_matches:
-                        dates.append(f"{dm[0]} {dm[1]}")
-        
-        # Look for times (4-digit numbers that look like times)
-        for i in range(data_start, min(len(lines), data_start + 30)):
-            line = lines[i].strip()
-            if re.match(r'^\d{4}$', line):
-                time_val = int(line)
-                if 0 <= time_val <= 2359:
-                    times.append(line)
-        
-        # Look for latitudes (DD-MM.MN or DD-MMN patterns)
-        lat_pattern = re.compile(r'(\d{1,2})-(\d{2})(?:\.(\d))?([NS])?')
-        lon_pattern = re.compile(r'(\d{2,3})-(\d{2})(?:\.(\d))?([EW])?')
-        
+        # One pass over the lines after the contact numbers: dates and
+        # times are in the next 30, positions in the next 50
         for i in range(data_start, min(len(lines), data_start + 50)):
             line = lines[i]
-            # Check for latitude
-            for match in lat_pattern.finditer(line):
-                deg = int(match.group(1))
-                mins = int(match.group(2))
-                dec = int(match.group(3)) if match.group(3) else 0
-                direction = match.group(4) or 'N'
+            
+            if i < data_start + 30:
+                # Dates: every date on a line with a month name, once for
+                # each (distinct) month name found
+                months_found = len(set(MONTH_NAME_PATTERN.findall(line)))
+                if months_found:
+                    date_matches = DATE_PATTERN.findall(line)
+                    dates.extend([f"{dm[0]} {dm[1]}" for dm in date_matches] * months_found)
+                
+                # Times (4-digit numbers that look like times)
+                stripped = line.strip()
+                if TIME_PATTERN.match(stripped):
+                    time_val = int(stripped)
+                    if 0 <= time_val <= 2359:
+                        times.append(stripped)
+            
+            # Latitudes (DD-MM.MN or DD-MMN patterns)
+            for deg, mins, dec, direction in LAT_PATTERN.findall(line):
+                deg = int(deg)
+                mins = int(mins)
+                dec = int(dec) if dec else 0
+                direction = direction or 'N'
                 if 0 <= deg <= 40:  # Valid lat range for Pacific
                     lat = deg + (mins + dec/10) / 60
                     if direction == 'S':
                         lat = -lat
                     latitudes.append(lat)
             
-            # Check for longitude
-            for match in lon_pattern.finditer(line):
-                deg = int(match.group(1))
-                mins = int(match.group(2))
-                dec = int(match.group(3)) if match.group(3) else 0
-                direction = match.group(4) or 'E'
+            # Longitudes
+            for deg, mins, dec, direction in LON_PATTERN.findall(line):
+                deg = int(deg)
+                mins = int(mins)
+                dec = int(dec) if dec else 0
+                direction = direction or 'E'
                 if 100 <= deg <= 180:  # Valid lon range for Pacific
                     lon = deg + (mins + dec/10) / 60
                     if direction == 'W':
@@ -151,9 +155,10 @@ def parse_patrol1_aircraft():
         
         # Look for aircraft types
         ac_types = []
-        for ac in ['PBM', 'PBY', 'Sally', 'Emily', 'Kate', 'Betty', 'Botty', 'Nell']:
-            if ac.lower() in text.lower():
-                count = len(re.findall(ac, text, re.IGNORECASE))
+        text_lower = text.lower()
+        for ac, pattern in AC_TYPE_PATTERNS:
+            if ac.lower() in text_lower:
+                count = len(pattern.findall(text))
                 ac_types.extend([ac] * count)
         
         print(f"  Page {page_num}: contacts={contact_numbers}, dates={len(dates)}, times={len(times)}, lats={len(latitudes)}, lons={len(longitudes)}")
@@ -4,90 +4,62 @@ Parse aircraft contact tables from Patrol 1 (pages 22-28).
 Uses known table structure: 32 contacts, ~5 per page.
 """
 
-import json
 import re
 
-REPORTS_DIR = "/home/jmknapp/cobia/patrolReports"
+from aircraft_core import (
+    compile_types, extract_dates, extract_times, load_ocr, parse_pages,
+)
+
+# Coordinates like 12-41N, 170-30E
+LAT_PATTERN = re.compile(r'(\d{1,2})-(\d{2})(?:\.(\d))?([NS])')
+LON_PATTERN = re.compile(r'(\d{2,3})-(\d{2})(?:\.(\d))?([EW])')
+
+TYPE_PATTERNS = compile_types([
+    (r'US\s+PBM', 'PBM', True),
+    (r'\bPBM\b', 'PBM', True),
+    (r'\bPBY\b', 'PBY', True),
+    (r'\bSally\b', 'Sally', False),
+    (r'\bEmily\b', 'Emily', False),
+    (r'\bKate\b', 'Kate', False),
+    (r'\bBetty\b', 'Betty', False),
+    (r'\bBotty\b', 'Betty', False),  # OCR error
+    (r'\bNell\b', 'Nell', False),
+])
 
 def extract_positions(text):
     """Extract lat/lon pairs from OCR text."""
     positions = []
     
-    # Pattern for coordinates like 12-41N, 170-30E
-    lat_pattern = r'(\d{1,2})-(\d{2})(?:\.(\d))?([NS])'
-    lon_pattern = r'(\d{2,3})-(\d{2})(?:\.(\d))?([EW])'
-    
-    lat_matches = list(re.finditer(lat_pattern, text))
-    lon_matches = list(re.finditer(lon_pattern, text))
-    
     lats = []
-    for m in lat_matches:
-        deg = int(m.group(1))
-        mins = int(m.group(2))
-        dec = int(m.group(3)) if m.group(3) else 0
+    for deg, mins, dec, direction in LAT_PATTERN.findall(text):
+        deg = int(deg)
+        mins = int(mins)
+        dec = int(dec) if dec else 0
         lat = deg + (mins + dec/10) / 60
-        if m.group(4) == 'S':
+        if direction == 'S':
             lat = -lat
         lats.append(lat)
     
     lons = []
-    for m in lon_matches:
-        deg = int(m.group(1))
-        mins = int(m.group(2))  
-        dec = int(m.group(3)) if m.group(3) else 0
+    for deg, mins, dec, direction in LON_PATTERN.findall(text):
+        deg = int(deg)
+        mins = int(mins)
+        dec = int(dec) if dec else 0
         lon = deg + (mins + dec/10) / 60
-        if m.group(4) == 'W':
+        if direction == 'W':
             lon = -lon
         lons.append(lon)
     
     return lats, lons
 
-def extract_dates(text):
-    """Extract dates like '27 June' or '13 August'."""
-    months = ['January', 'February', 'March', 'April', 'May', 'June', 
-              'July', 'August', 'September', 'October', 'November', 'December']
-    pattern = r'(\d{1,2})\s+(' + '|'.join(months) + ')'
-    matches = re.findall(pattern, text, re.IGNORECASE)
-    return [f"{m[0]} {m[1]}" for m in matches]
-
-def extract_times(text):
-    """Extract 4-digit times from lines."""
-    times = []
-    for line in text.split('\n'):
-        line = line.strip()
-        # Must be exactly 4 digits and a valid time
-        if re.match(r'^\d{4}$', line):
-            val = int(line)
-            if 0 <= val <= 2359:
-                times.append(line)
-        # Also check for times at start of line
-        m = re.match(r'^(\d{4})\s', line)
-        if m:
-            val = int(m.group(1))
-            if 0 <= val <= 2359:
-                times.append(m.group(1))
-    return times
-
 def extract_types(text):
     """Extract aircraft types."""
     types = []
     # Check for US PBM, PBY (friendlies)
     text_lower = text.lower()
     
-    type_patterns = [
-        (r'US\s+PBM', 'PBM', True),
-        (r'\bPBM\b', 'PBM', True),
-        (r'\bPBY\b', 'PBY', True),
-        (r'\bSally\b', 'Sally', False),
-        (r'\bEmily\b', 'Emily', False),
-        (r'\bKate\b', 'Kate', False),
-        (r'\bBetty\b', 'Betty', False),
-        (r'\bBotty\b', 'Betty', False),  # OCR error
-        (r'\bNell\b', 'Nell', False),
-    ]
-    
-    for pattern, name, friendly in type_patterns:
-        for _ in re.finditer(pattern, text, re.IGNORECASE):
+    for pattern, name, friendly in TYPE_PATTERNS:
+        for _ in pattern.finditer(text):
             types.append((name, friendly))
     
     return types
@@ -128,28 +100,12 @@ def parse_page(page_num, text, start_contact, num_contacts):
     return contacts
 
 def main():
-    with open(f'{REPORTS_DIR}/USS_Cobia_1st_Patrol_Report_gv_ocr.json') as f:
-        ocr = json.load(f)
+    ocr = load_ocr()
     
     print("Parsing Patrol 1 Aircraft Contacts...")
     print("=" * 70)
     
-    # Known structure: contacts 1-32 across pages 22-28
-    page_map = [
-        (22, 1, 5),   # page, start_contact, num_contacts
-        (23, 6, 5),
-        (24, 11, 5),
-        (25, 16, 5),
-        (26, 21, 5),
-        (27, 26, 5),
-        (28, 31, 2),
-    ]
-    
-    all_contacts = []
-    for page_num, start_contact, num_contacts in page_map:
-        text = ocr.get(str(page_num), '')
-        contacts = parse_page(page_num, text, start_contact, num_contacts)
-        all_contacts.extend(contacts)
+    all_contacts = parse_pages(ocr, parse_page)
     
     print(f"\n{'='*70}")
     print(f"Extracted {len(all_contacts)} aircraft contacts")
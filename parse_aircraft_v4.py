@@ -4,25 +4,32 @@ Parse aircraft contact tables from Patrol 1 (pages 22-28).
 Simple approach: separate lat/lon purely by degree values.
 """
 
-import json
-import re
 import csv
 
-REPORTS_DIR = "/home/jmknapp/cobia/patrolReports"
+from aircraft_core import (
+    COORD_PATTERN, REPORTS_DIR, compile_types, extract_dates, extract_times,
+    load_ocr, parse_pages, types_in_order,
+)
+
+TYPE_PATTERNS = compile_types([
+    (r'US\s*PBM|PBM', 'PBM', True),
+    (r'PBY', 'PBY', True),
+    (r'Sally', 'Sally', False),
+    (r'Emily', 'Emily', False),
+    (r'Kate', 'Kate', False),
+    (r'Bett?y|Botty', 'Betty', False),
+    (r'Nell', 'Nell', False),
+])
 
 def extract_positions(text):
     """Extract lat/lon based on degree values only."""
     lats = []
     lons = []
     
-    # Match any coordinate pattern: DD-MM.D or DDD-MM.D with optional direction
-    pattern = r'(\d{1,3})-(\d{2})(?:\.(\d))?([NSEW])?'
-    
-    for m in re.finditer(pattern, text):
-        deg = int(m.group(1))
-        mins = int(m.group(2))
-        dec = int(m.group(3)) if m.group(3) else 0
-        direction = m.group(4)
+    for deg, mins, dec, direction in COORD_PATTERN.findall(text):
+        deg = int(deg)
+        mins = int(mins)
+        dec = int(dec) if dec else 0
         
         value = deg + (mins + dec/10) / 60
         
@@ -37,48 +44,11 @@ def extract_positions(text):
     
     return lats, lons
 
-def extract_dates(text):
-    months = ['January', 'February', 'March', 'April', 'May', 'June', 
-              'July', 'August', 'September', 'October', 'November', 'December']
-    pattern = r'(\d{1,2})\s+(' + '|'.join(months) + ')'
-    matches = re.findall(pattern, text, re.IGNORECASE)
-    return [f"{m[0]} {m[1]}" for m in matches]
-
-def extract_times(text):
-    times = []
-    for line in text.split('\n'):
-        line = line.strip()
-        if re.match(r'^\d{4}$', line):
-            val = int(line)
-            if 0 <= val <= 2359:
-                times.append(line)
-    return times
-
-def extract_types(text):
-    types = []
-    type_patterns = [
-        (r'US\s*PBM|PBM', 'PBM', True),
-        (r'PBY', 'PBY', True),
-        (r'Sally', 'Sally', False),
-        (r'Emily', 'Emily', False),
-        (r'Kate', 'Kate', False),
-        (r'Bett?y|Botty', 'Betty', False),
-        (r'Nell', 'Nell', False),
-    ]
-    
-    all_matches = []
-    for pattern, name, friendly in type_patterns:
-        for m in re.finditer(pattern, text, re.IGNORECASE):
-            all_matches.append((m.start(), name, friendly))
-    
-    all_matches.sort(key=lambda x: x[0])
-    return [(m[1], m[2]) for m in all_matches]
-
 def parse_page(page_num, text, start_contact, num_contacts):
     dates = extract_dates(text)
-    times = extract_times(text)
+    times = extract_times(text, line_start=False)
     lats, lons = extract_positions(text)
-    types = extract_types(text)
+    types = types_in_order(text, TYPE_PATTERNS)
     
     print(f"  Page {page_num}: contacts {start_contact}-{start_contact+num_contacts-1}, dates={len(dates)}, times={len(times)}, lats={len(lats)}, lons={len(lons)}")
     
@@ -101,27 +71,12 @@ def parse_page(page_num, text, start_contact, num_contacts):
     return contacts
 
 def main():
-    with open(f'{REPORTS_DIR}/USS_Cobia_1st_Patrol_Report_gv_ocr.json') as f:
-        ocr = json.load(f)
+    ocr = load_ocr()
     
     print("Parsing Patrol 1 Aircraft Contacts")
     print("=" * 70)
     
-    page_map = [
-        (22, 1, 5),
-        (23, 6, 5),
-        (24, 11, 5),
-        (25, 16, 5),
-        (26, 21, 5),
-        (27, 26, 5),
-        (28, 31, 2),
-    ]
-    
-    all_contacts = []
-    for page_num, start_contact, num_contacts in page_map:
-        text = ocr.get(str(page_num), '')
-        contacts = parse_page(page_num, text, start_contact, num_contacts)
-        all_contacts.extend(contacts)
+    all_contacts = parse_pages(ocr, parse_page)
     
     print(f"\n{'='*70}")
     print(f"Extracted {len(all_contacts)} aircraft contacts")
@@ -0,0 +1,97 @@
+"""
+Shared pieces of the Google Cloud Vision OCR scripts (google_vision_ocr and
+google_vision_ocr_v2): report list, page image listing and ordering, the
+Vision client, request batching, and the per-page OCR cache.
+"""
+
+import os
+import re
+import json
+import hashlib
+from functools import lru_cache
+from google.cloud import vision
+
+COBIA_DIR = "/home/jmknapp/cobia"
+OUTPUT_DIR = os.path.join(COBIA_DIR, "patrolReports")
+
+# Report folders mapping: (image folder under COBIA_DIR, output base name)
+REPORTS = [
+    ("cobia_1st_patrol_report", "USS_Cobia_1st_Patrol_Report"),
+    ("cobia_2nd_patrol_report", "USS_Cobia_2nd_Patrol_Report"),
+    ("cobia_3rd_patrol_report", "USS_Cobia_3rd_Patrol_Report"),
+    ("cobia_4th_patrol_report", "USS_Cobia_4th_Patrol_Report"),
+    ("cobia_5th_patrol_report", "USS_Cobia_5th_Patrol_Report"),
+    ("cobia_6th_patrol_report", "USS_Cobia_6th_Patrol_Report"),
+]
+
+# Page image types, matched case-sensitively like a "*.jpg" glob would
+IMAGE_SUFFIXES = ('.jpg', '.png')
+
+# Page images are named page_NN[_NNNN].jpg; the numbers aren't padded past
+# two digits, so a string sort would put page_100 before page_11
+DIGITS = re.compile(r'\d+')
+
+def page_sort_key(image_path):
+    """Sort key ordering image files by the numbers in their names."""
+    return [int(n) for n in DIGITS.findall(os.path.basename(image_path))]
+
+def list_page_images(folder_path):
+    """A report folder's page images (hidden files skipped), in page order."""
+    with os.scandir(folder_path) as entries:
+        return sorted((entry.path for entry in entries
+                       if entry.name.endswith(IMAGE_SUFFIXES)
+                       and not entry.name.startswith('.')), key=page_sort_key)
+
+@lru_cache(maxsize=1)
+def get_vision_client():
+    """Create the Vision client (gRPC channel, credentials) once per run."""
+    return vision.ImageAnnotatorClient()
+
+# batch_annotate_images takes at most 16 images, and the request itself is
+# size-limited, so batches are capped on both counts
+BATCH_SIZE = 16
+BATCH_BYTES = 8 * 1024 * 1024
+# Batches in flight at once; each thread just waits on its gRPC call
+OCR_WORKERS = 8
+
+def image_batches(image_paths):
+    """Split image paths, in order, into batches within the Vision request limits."""
+    batch, batch_bytes = [], 0
+    for image_path in image_paths:
+        size = os.path.getsize(image_path)
+        if batch and (len(batch) == BATCH_SIZE or batch_bytes + size > BATCH_BYTES):
+            yield batch
+            batch, batch_bytes = [], 0
+        batch.append(image_path)
+        batch_bytes += size
+    if batch:
+        yield batch
+
+# Per-page OCR results, keyed by a hash of the image bytes, so a rerun after
+# a failure (timeout, quota) only sends Vision the pages it hasn't done yet.
+# google_vision_ocr.py stores the text, google_vision_ocr_v2.py the text and
+# words.
+OCR_CACHE_DIR = os.path.join(OUTPUT_DIR, ".ocr_cache")
+
+def ocr_cache_path(content):
+    """Cache file for an image with these bytes."""
+    return os.path.join(OCR_CACHE_DIR, hashlib.sha1(content).hexdigest() + ".json")
+
+def load_cached_ocr(cache_file):
+    """Return a cached OCR entry, or None if there isn't a readable one."""
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_cached_ocr(cache_file, entry):
+    """Write an OCR entry atomically; a cache that can't be written is skipped."""
+    try:
+        os.makedirs(OCR_CACHE_DIR, exist_ok=True)
+        tmp_file = cache_file + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        pass